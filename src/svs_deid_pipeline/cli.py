@@ -44,15 +44,10 @@ def run_command(
         log_level=log_level,
     )
     outputs = run_pipeline(config_obj)
-    status_path = outputs.get("status_csv")
-    if status_path and not config_obj.dry_run:
-        import pandas as pd
-
-        status_df = pd.read_csv(status_path)
-        failures = int((status_df["status"] != "success").sum())
-        if failures > 0 and not config_obj.allow_partial:
-            console.print("Pipeline completed with failures.")
-            raise typer.Exit(code=2)
+    # run_pipeline counts failures itself, so status.csv is not read back here
+    if not config_obj.dry_run and outputs["failures"] > 0 and not config_obj.allow_partial:
+        console.print("Pipeline completed with failures.")
+        raise typer.Exit(code=2)
     console.print("Pipeline completed.")
 
 
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import copy
+import functools
+import json
 import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Mapping
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _parse_bool(value: str | None) -> bool | None:
     if value is None:
@@ -25,15 +32,90 @@ def _coerce_path(value: str | Path | None) -> Path | None:
     return value if isinstance(value, Path) else Path(value)
 
 
-def _read_yaml(path: Path) -> dict[str, Any]:
+def _json_sidecar(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".json")
+
+
+def _write_json_sidecar(sidecar: Path, data: dict[str, Any], mtime_ns: int, size: int) -> None:
+    try:
+        text = json.dumps(data)
+    except (TypeError, ValueError):
+        return
+    # skip configs that JSON cannot represent faithfully (dates, non-str keys, ...)
+    if json.loads(text) != data:
+        return
+    # stamp the sidecar with the YAML it was built from; mtimes alone can go backwards
+    text = json.dumps({"mtime_ns": mtime_ns, "size": size, "data": data})
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=sidecar.parent, prefix=f".{sidecar.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(text)
+            os.replace(tmp_name, sidecar)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        # the sidecar is only a cache; read-only config dirs are fine
+        pass
+
+
+@functools.lru_cache(maxsize=32)
+def _read_yaml_cached(path_str: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    # mtime_ns and size are part of the cache key so edits invalidate it, and must
+    # match the sidecar's stamp exactly before its cached copy is used.
+    path = Path(path_str)
+    sidecar = _json_sidecar(path)
+    try:
+        with sidecar.open("r", encoding="utf-8") as handle:
+            cached = json.load(handle)
+        if (
+            isinstance(cached, dict)
+            and cached.get("mtime_ns") == mtime_ns
+            and cached.get("size") == size
+            and isinstance(cached.get("data"), dict)
+        ):
+            return cached["data"]
+    except (OSError, ValueError):
+        pass
+
     with path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+        data = yaml.load(handle, Loader=_YAML_LOADER) or {}
     if not isinstance(data, dict):
         raise ValueError("Config YAML must contain a mapping at the top level.")
+    _write_json_sidecar(sidecar, data, mtime_ns, size)
     return data
 
 
-def _read_env(env: Mapping[str, str]) -> dict[str, Any]:
+def _read_yaml(path: Path) -> dict[str, Any]:
+    stat = path.stat()
+    data = _read_yaml_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    # callers may mutate the result, so never hand out the cached object
+    return copy.deepcopy(data)
+
+
+_SVS_DEID_KEYS = (
+    "SVS_DEID_MANIFEST",
+    "SVS_DEID_OUT_DIR",
+    "SVS_DEID_S3_BUCKET",
+    "SVS_DEID_S3_PREFIX",
+    "SVS_DEID_S3_REGION",
+    "SVS_DEID_OPENSLIDE_PATH",
+    "SVS_DEID_LOG_LEVEL",
+    "SVS_DEID_WORKERS",
+    "SVS_DEID_DRY_RUN",
+    "SVS_DEID_ALLOW_PARTIAL",
+    "SVS_DEID_FAIL_FAST",
+    "SVS_DEID_RESUME",
+    "SVS_DEID_KEEP_LOCAL",
+    "SVS_DEID_MAX_FILES",
+)
+
+
+def _read_env(env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    if env is None:
+        # only the SVS_DEID_* keys are looked up, so skip copying the whole environment
+        env = {key: value for key in _SVS_DEID_KEYS if (value := os.environ.get(key)) is not None}
     return {
         "manifest": env.get("SVS_DEID_MANIFEST"),
         "out_dir": env.get("SVS_DEID_OUT_DIR"),
@@ -98,7 +180,7 @@ def load_config(
     max_files: int | None = None,
     env: Mapping[str, str] | None = None,
 ) -> PipelineConfig:
-    env_data = _read_env(env or os.environ)
+    env_data = _read_env(env)
     yaml_data: dict[str, Any] = {}
     config_path_obj = _coerce_path(config_path)
     if config_path_obj:
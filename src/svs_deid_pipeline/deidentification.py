@@ -14,12 +14,29 @@ if TYPE_CHECKING:
 import struct
 import shutil
 import re
+import ctypes
+import ctypes.util
+import sys
 import threading
-import copy
-import warnings
+import contextlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 logger = logging.getLogger('idcprep')
+
+# tifffile is imported on first use and cached here; avoids re-importing in per-file loops
+_TiffFile = None
+
+# `Filename = ...` / `ImageID = ...` entries of an Aperio description, one per '|'-separated field
+_FN_IMG_RE = re.compile(r'(?:^|\|)(Filename|ImageID) = ([^|]*)')
+
+def _get_tifffile():
+    global _TiffFile
+    if _TiffFile is None:
+        from tifffile import TiffFile
+        _TiffFile = TiffFile
+    return _TiffFile
 
 
 
@@ -50,14 +67,21 @@ def validate_deidentify_metadata_all(manifest_path:str):
     manifest_df = pd.read_csv(manifest_path)
     locations = manifest_df['location'].dropna().to_list()
 
-    all_reports = []
-
-    for path in tqdm(locations, desc=f'Validating deidentification'):
-        report = validate_deidentify_metadata(path)
-        all_reports.append(report)
-
-
-    tdf = pd.DataFrame(all_reports)
+    # validation rewrites descriptions in place, so each file gets one thread even when
+    # the manifest lists it twice (or under another path)
+    unique: dict[str, str] = {}
+    for location in locations:
+        unique.setdefault(os.path.realpath(location), location)
+
+    # header parsing is I/O bound, so validate files concurrently
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        reports = dict(zip(unique, tqdm(ex.map(validate_deidentify_metadata, unique.values()),
+                                        total=len(unique),
+                                        desc=f'Validating deidentification')))
+    all_reports = [{**reports[os.path.realpath(location)], 'path': location} for location in locations]
+
+    tdf = pd.DataFrame.from_records(all_reports, columns=['path', 'clean_filename', 'no_label', 'no_macro'])
    
     tdf.to_csv(export_path, index=False)
     print(f'Exported validation results to {export_path}')
@@ -93,9 +117,8 @@ def validate_deidentify_metadata(svs_path:str, validate_mode:bool=False, verbose
         'no_macro': True
     }
 
+    TiffFile = _get_tifffile()
 
-    from tifffile import TiffFile
-
     with open(svs_path, 'r+b') as fp:
         t = TiffFile(fp)
         
@@ -105,7 +128,13 @@ def validate_deidentify_metadata(svs_path:str, validate_mode:bool=False, verbose
         if isinstance(gt_check, dict):
             validation_report.update(gt_check)
 
-        for page in t.pages:
+        # validation only reads descriptions, so skip building full TiffPage objects
+        if validate_mode:
+            pages = [_PageDescription(o, d) for o, d in _ifd_info(fp, t, svs_path)[1]]
+        else:
+            pages = t.pages
+
+        for page in pages:
             # filename deid validation
             clean_filename = screen_filename(page, validation_mode=validate_mode)
 
@@ -118,8 +147,20 @@ def validate_deidentify_metadata(svs_path:str, validate_mode:bool=False, verbose
 
             if 'macro' in page.description: # type: ignore
                 validation_report['no_macro'] = False
+
+            # every flag has flipped from its default, so later pages cannot change the report.
+            # only safe in validate mode; otherwise screen_filename still has to rewrite each page
+            if (validate_mode
+                    and validation_report['clean_filename']
+                    and not validation_report['no_label']
+                    and not validation_report['no_macro']):
+                break
         t.close()
 
+    if not validate_mode:
+        # screen_filename may have rewritten descriptions in place
+        _forget_ifd_info(svs_path)
+
 
     # ? very nested verbose printing logic, primarily because I wanted to log everything regardless
     # ? despite potentially making verbose printing obsolete
@@ -141,7 +182,113 @@ def validate_deidentify_metadata(svs_path:str, validate_mode:bool=False, verbose
 
     return validation_report
 
-def screen_filename(page: "TiffPage | TiffFrame", validation_mode: bool = False):
+# _PageDescription: stand-in for TiffPage when only the ImageDescription is needed
+class _PageDescription:
+    __slots__ = ('description', 'offset')
+    def __init__(self, offset, description):
+        self.offset = offset
+        self.description = description
+
+def _read_page_descriptions(fp, tiff_file: "TiffFile") -> list[_PageDescription]:
+    """ Walk the IFD chain reading only the ImageDescription tag of each page
+
+        tifffile's TiffFrame would avoid full tag parsing too, but frames have no tags
+        and share their keyframe's description, and SVS pages differ in shape.
+
+        Parameters
+        ----------
+            fp : file
+                Open binary handle of the TIFF file
+            tiff_file : TiffFile
+                TiffFile opened on `fp`; used for the first IFD offset and header format
+
+        Returns
+        -------
+            pages : list, length=n_pages
+                `offset` and `description` for each top-level page, in file order
+    """
+    tiff = tiff_file.tiff
+    unpack = struct.unpack
+    tagsize = tiff.tagsize
+    pages = []
+    seen = set()
+    offset = tiff_file.pages[0].offset
+    while offset and offset not in seen:
+        seen.add(offset)
+        fp.seek(offset)
+        (num_tags,) = unpack(tiff.tagnoformat, fp.read(tiff.tagnosize))
+        tagdata = fp.read(num_tags*tagsize)
+        (next_offset,) = unpack(tiff.offsetformat, fp.read(tiff.offsetsize))
+
+        description = ''
+        for i in range(0, num_tags*tagsize, tagsize):
+            (code, _) = unpack(tiff.tagformat1, tagdata[i:i+4])
+            if code != 270: # ImageDescription
+                continue
+            (count, value) = unpack(tiff.tagformat2, tagdata[i+4:i+tagsize])
+            if count > tiff.offsetsize:
+                (valueoffset,) = unpack(tiff.offsetformat, value)
+                fp.seek(valueoffset)
+                value = fp.read(count)
+            value = value[:count].split(b'\0', 1)[0]
+            try:
+                description = value.decode('utf-8')
+            except UnicodeDecodeError:
+                description = value.decode('cp1252', errors='replace')
+            # tifffile strips surrounding whitespace from page.description too
+            description = description.strip()
+            break
+
+        pages.append(_PageDescription(offset, description))
+        offset = next_offset
+    return pages
+
+# IFD offsets/descriptions keyed by (path, mtime_ns, size), shared by validation and
+# delete_associated_image so a file validated then stripped only walks its IFDs once
+_IFD_INFO_CACHE: "OrderedDict[tuple[str, int, int], tuple[str, tuple[tuple[int, str], ...]]]" = OrderedDict()
+_IFD_INFO_CACHE_SIZE = 64
+_IFD_INFO_LOCK = threading.Lock()
+
+def _ifd_info(fp, tiff_file: "TiffFile", path) -> tuple[str, tuple[tuple[int, str], ...]]:
+    """ Cached (first page description, ((offset, description), ...)) for an open TIFF
+
+        Parameters
+        ----------
+            fp : file
+                Open binary handle of the TIFF file
+            tiff_file : TiffFile
+                TiffFile opened on `fp`
+            path : str
+                Path of the file, used with its mtime and size as the cache key
+    """
+    stat = os.fstat(fp.fileno())
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _IFD_INFO_LOCK:
+        info = _IFD_INFO_CACHE.get(key)
+        if info is not None:
+            _IFD_INFO_CACHE.move_to_end(key)
+            return info
+
+    pages = _read_page_descriptions(fp, tiff_file)
+    info = (pages[0].description if pages else '', tuple((p.offset, p.description) for p in pages))
+    with _IFD_INFO_LOCK:
+        _IFD_INFO_CACHE[key] = info
+        while len(_IFD_INFO_CACHE) > _IFD_INFO_CACHE_SIZE:
+            _IFD_INFO_CACHE.popitem(last=False)
+    return info
+
+def _forget_ifd_info(path):
+    """ Drop cached IFD info for a file that was just modified
+
+        mtime alone is not enough: two writes within one filesystem timestamp tick
+        would otherwise reuse the stale entry.
+    """
+    abspath = os.path.abspath(path)
+    with _IFD_INFO_LOCK:
+        for key in [k for k in _IFD_INFO_CACHE if k[0] == abspath]:
+            del _IFD_INFO_CACHE[key]
+
+def screen_filename(page: "TiffPage | TiffFrame | _PageDescription", validation_mode: bool = False):
     """ Checks the Filename metadata element within the page description against the 
         ImageID metadata element. If not using for validation, will overwrite Filename
         metadata.
@@ -161,20 +308,20 @@ def screen_filename(page: "TiffPage | TiffFrame", validation_mode: bool = False)
     if 'Filename' not in page.description: # type: ignore
         return
 
-    # restructure description string to get Filename and ImageID metadata as key-value pairs
-    descr_parts = page.description.split('|') # type: ignore
-    fn_and_imageid = [i for i in descr_parts if 'Filename = ' in i or 'ImageID = ' in i]      
+    # single scan of the description for the Filename and ImageID fields
+    description = page.description # type: ignore
+    fn_and_imageid = list(_FN_IMG_RE.finditer(description)) # type: ignore
     
     # ensures additional metadata was not unknowingly extracted 
     if len(fn_and_imageid) > 2:
-        raise ValueError(f'More than 2 keys identified with "Filename = " and "ImageID = ": {fn_and_imageid}')
+        raise ValueError(f'More than 2 keys identified with "Filename = " and "ImageID = ": {[m.group(0).lstrip("|") for m in fn_and_imageid]}')
     
-    # reformat into dict map for easier value comparison
-    kvp = {k:v for k,v in [tuple(i.split(' = ')) for i in fn_and_imageid]}
+    # map key to its match for value comparison and in-place replacement
+    kvp = {m.group(1):m for m in fn_and_imageid}
     
     # Filename should be identical to ImageID
     # explictly calling keys also ensures the correct key-value pairs were extracted
-    if kvp['Filename'] == kvp['ImageID']:
+    if kvp['Filename'].group(2) == kvp['ImageID'].group(2):
         #! can print, but will do so twice for each image since filename is encoded in two layers 
         # print(f'Filename and ImageID are identical for {kvp['ImageID']}.svs')
         return True
@@ -184,16 +331,14 @@ def screen_filename(page: "TiffPage | TiffFrame", validation_mode: bool = False)
         # ! If the flagged image has been assessed by this function before, flags for manual review
         return False
 
-    # create new map with updated Filename
-    # original map will be used to identify string within description for replacement
-    updated_kvp = {i:kvp['ImageID'] for i in kvp.keys()}
-
-    # reformat to match description string format
-    # order of elements (Filename, ImageID) are preserved in kvp 
-    updated_format = [f'{k} = {v}' for k, v in updated_kvp.items()]
+    # splice the ImageID value over the Filename value using the match span
+    filename_match = kvp['Filename']
+    updated_description = (description[:filename_match.start(2)]  # type: ignore
+                           + kvp['ImageID'].group(2)
+                           + description[filename_match.end(2):]) # type: ignore
 
     # overwrite svs tag with updated description reflecting the new Filename
-    page.tags['ImageDescription'].overwrite(page.description.replace(fn_and_imageid[0], updated_format[0])) # type: ignore
+    page.tags['ImageDescription'].overwrite(updated_description) # type: ignore
     # print(f'Updated Filename metadata to match the ImageID for _') # ! can print if want to track
 
 def _gt450_image_check(tiff_file: "TiffFile"):
@@ -236,9 +381,52 @@ def _gt450_image_check(tiff_file: "TiffFile"):
 
 # @@@@@@@@@@@@@@@@@@@@@@@  IMAGE DEIDENTIFICATION @@@@@@@@@@@@@@@@@@@@@@@@@
 
+# shared zero buffer for wiping image data without allocating a fresh bytes object per write
+_ZERO = bytes(4 * 1024 * 1024)
+_ZERO_VIEW = memoryview(_ZERO)
+
+def _write_zeros(fp, length):
+    remaining = length
+    while remaining:
+        n = min(remaining, len(_ZERO))
+        fp.write(_ZERO if n == len(_ZERO) else _ZERO_VIEW[:n])
+        remaining -= n
+
+# fallocate(2) flags: deallocate a byte range but keep the file size
+_FALLOC_FL_KEEP_SIZE = 0x01
+_FALLOC_FL_PUNCH_HOLE = 0x02
+
+def _load_fallocate():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fallocate = getattr(libc, 'fallocate64', None) or libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    fallocate.restype = ctypes.c_int
+    return fallocate
+
+_fallocate = _load_fallocate()
+
+# _zero_range: make a byte range read back as zeros
+#   on sparse-capable filesystems the blocks are deallocated (punched) instead of written,
+#   otherwise falls back to writing zeros
+def _zero_range(fp, offset, length):
+    if length <= 0:
+        return
+    if _fallocate is not None:
+        # pending buffered writes must land before the range is punched
+        fp.flush()
+        if _fallocate(fp.fileno(), _FALLOC_FL_PUNCH_HOLE | _FALLOC_FL_KEEP_SIZE, offset, length) == 0:
+            return
+    fp.seek(offset)
+    _write_zeros(fp, length)
+
 # delete_associated_image will remove a label or macro image from an SVS file
 def delete_associated_image(slide_path, image_type):
-    from tifffile import TiffFile
+    TiffFile = _get_tifffile()
     # THIS WILL ONLY WORK FOR STRIPED IMAGES CURRENTLY, NOT TILED
 
     allowed_image_types=['label','macro'];
@@ -253,20 +441,21 @@ def delete_associated_image(slide_path, image_type):
     # in contrast, the GT450 scanner creates svs files which do not have this, but the label
     # and macro images are always the last two pages and are striped, not tiled.
     # The header of the first page will contain a description that indicates which file type it is
-    first_page=t.pages[0]
-    filtered_pages=[]
-    if 'Aperio Image Library' in first_page.description: # type: ignore
-        filtered_pages = [page for page in t.pages if image_type in page.description] # type: ignore
-    elif 'Aperio Leica Biosystems GT450' in first_page.description: # type: ignore
+    # pages are selected from the cached descriptions; only the chosen page is parsed by tifffile
+    first_description, page_infos = _ifd_info(fp, t, slide_path)
+    filtered_indices=[]
+    if 'Aperio Image Library' in first_description:
+        filtered_indices = [i for i, (_, d) in enumerate(page_infos) if image_type in d]
+    elif 'Aperio Leica Biosystems GT450' in first_description:
         if image_type=='label':
-            filtered_pages=[t.pages[-2]]
+            filtered_indices=[len(page_infos)-2]
         else:
-            filtered_pages=[t.pages[-1]]
+            filtered_indices=[len(page_infos)-1]
     else:
         # default to old-style labeled pages
-        filtered_pages = [page for page in t.pages if image_type in page.description] # type: ignore
+        filtered_indices = [i for i, (_, d) in enumerate(page_infos) if image_type in d]
 
-    num_results = len(filtered_pages)
+    num_results = len(filtered_indices)
     if num_results > 1:
         raise Exception(f'Invalid SVS format: duplicate associated {image_type} images found')
     if num_results == 0:
@@ -274,7 +463,7 @@ def delete_associated_image(slide_path, image_type):
         return
 
     # At this point, exactly 1 image has been identified to remove
-    page = filtered_pages[0]
+    page = t.pages[filtered_indices[0]]
 
     # get the list of IFDs for the various pages
     offsetformat = t.tiff.offsetformat
@@ -285,7 +474,10 @@ def delete_associated_image(slide_path, image_type):
     unpack = struct.unpack
 
     # start by saving this page's IFD offset
-    ifds = [{'this': p.offset} for p in t.pages]
+    ifds = [{'this': o} for o, _ in page_infos]
+    # index the IFDs by their own offset and by the offset they point to
+    by_offset = {}
+    by_next = {}
     # now add the next page's location and offset to that pointer
     for p in ifds:
         # move to the start of this page
@@ -299,17 +491,16 @@ def delete_associated_image(slide_path, image_type):
         p['next_ifd_offset'] = fp.tell()
         # read and save the value of the offset to the next page
         (p['next_ifd_value'],) = unpack(offsetformat, fp.read(offsetsize))
+        by_offset.setdefault(p['this'], p)
+        by_next.setdefault(p['next_ifd_value'], p)
 
     # filter out the entry corresponding to the desired page to remove
-    pageifd = [i for i in ifds if i['this'] == page.offset][0]
+    pageifd = by_offset[page.offset]
     # find the page pointing to this one in the IFD list
-    previfd = [i for i in ifds if i['next_ifd_value'] == page.offset]
+    previfd = by_next.get(page.offset)
     # check for errors
-    if(len(previfd) == 0):
+    if previfd is None:
         raise Exception('No page points to this one')
-        return
-    else:
-        previfd = previfd[0]
 
     # get the strip offsets and byte counts
     offsets = page.tags['StripOffsets'].value
@@ -318,14 +509,13 @@ def delete_associated_image(slide_path, image_type):
     # iterate over the strips and erase the data
     # print('Deleting pixel data from image strips')
     for (o, b) in zip(offsets, bytecounts):
-        fp.seek(o)
-        fp.write(b'\0'*b)
+        _zero_range(fp, o, b)
 
     # iterate over all tags and erase values if necessary
     # print('Deleting tag values')
     for key, tag in page.tags.items():
         fp.seek(tag.valueoffset)
-        fp.write(b'\0'*tag.count)
+        _write_zeros(fp, tag.count)
 
     offsetsize = t.tiff.offsetsize
     offsetformat = t.tiff.offsetformat
@@ -333,8 +523,7 @@ def delete_associated_image(slide_path, image_type):
 
     # next, zero out the data in this page's header
     # print('Deleting page header')
-    fp.seek(pageifd['this'])
-    fp.write(b'\0'*pagebytes)
+    _zero_range(fp, pageifd['this'], pagebytes)
 
     # finally, point the previous page's IFD to this one's IFD instead
     # this will make it not show up the next time the file is opened
@@ -342,33 +531,69 @@ def delete_associated_image(slide_path, image_type):
     fp.write(struct.pack(offsetformat, pageifd['next_ifd_value']))
 
     fp.close()
+    _forget_ifd_info(slide_path)
+
+# buffer size for the user-space fallback in _fast_copy; SVS files are often several GB
+_COPY_BUFSIZE = 16 * 1024 * 1024
+
+# _fast_copy: copy a file without bouncing bytes through user space where the OS allows it
+#   tries copy_file_range (reflinks on XFS/Btrfs), then sendfile, then a large-buffer copyfileobj
+def _fast_copy(src, dst):
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(infd).st_size
+        copied = 0
+        for name in ('copy_file_range', 'sendfile'):
+            if copied >= size or not hasattr(os, name):
+                continue
+            try:
+                while copied < size:
+                    # both calls read at an explicit source offset and advance the
+                    # destination's own position, so either can pick up where the other stopped
+                    if name == 'copy_file_range':
+                        n = os.copy_file_range(infd, outfd, size - copied, copied)
+                    else:
+                        n = os.sendfile(outfd, infd, copied, size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError:
+                # unsupported for this fs/platform; the next method resumes at `copied`
+                continue
+        if copied < size:
+            fsrc.seek(copied)
+            fdst.seek(copied)
+            shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
 
 # CopyOp: thread-safe file info to share data between copy and progress threads
+#   threadsafe=False swaps the lock for a no-op context when only one thread touches it
 class CopyOp(object):
-    def __init__(self, start = []):
-        self.lock = threading.Lock()
+    def __init__(self, start = [], threadsafe = True):
+        self.lock = threading.Lock() if threadsafe else contextlib.nullcontext()
         self.value = start
         self.original = start
     def update(self, index, val):
-        self.lock.acquire()
-        try:
+        with self.lock:
             for key, value in val.items():
                 self.value[index][key]=value
-        finally:
-            self.lock.release()
     def read(self):
-        self.lock.acquire()
-        cp = copy.deepcopy(self.value)
-        self.lock.release()
+        with self.lock:
+            # values are flat dicts of str/bool/int, so a per-dict copy is enough
+            cp = [d.copy() for d in self.value]
         return cp
 
 # copy_and_strip_all: iterate over all files and copy and remove labels
-def copy_and_strip_all(files,copyop:CopyOp):
-    [copy_and_strip(file,copyop,index) for index,file in enumerate(files)]
+#   the work is I/O bound, so files are spread over a thread pool; CopyOp is lock-protected
+def copy_and_strip_all(files,copyop:CopyOp,workers:int=1):
+    if workers <= 1:
+        [copy_and_strip(file,copyop,index) for index,file in enumerate(files)]
+        return
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(lambda i_f: copy_and_strip(i_f[1], copyop, i_f[0]), enumerate(files)))
 
 # copy_and_strip: single file copy/deidentify operation. 
 #   to be done in a thread for concurrent I/O using CopyOp object for progress updates 
-def copy_and_strip(file: dict[str, str], copyop: CopyOp, index: int):
+def copy_and_strip(file: dict[str, str], copyop: CopyOp, index: int):
     """
     
 
@@ -382,37 +607,59 @@ def copy_and_strip(file: dict[str, str], copyop: CopyOp, index: int):
     index : _type_
         _description_
     """
+    _copy_and_strip_nolock(file['source'], file['dest'], lambda val: copyop.update(index, val))
+    return
+
+# _copy_and_strip_nolock: copy_and_strip without a shared CopyOp, for single-file callers
+def _copy_and_strip_nolock(source: str, dest: str, on_update=None) -> dict[str, str | bool]:
+    """ Copy a single WSI and remove its label and macro images
+
+        Parameters
+        ----------
+            source : str
+                path of original file location
+            dest : str
+                path to desired file location for copied file
+            on_update : callable, optional
+                Called with each partial status update (e.g. to forward to a CopyOp)
+
+        Returns
+        -------
+            status : dict
+                `dest`, `renamed`, `failed`, `failure_message` and `done` for the copy
+    """
+    status: dict[str, str | bool] = {
+        'dest': None, # type: ignore
+        'renamed': False,
+        'failed': False,
+        'failure_message': '',
+        'done': False,
+    }
+
+    def update(val):
+        status.update(val)
+        if on_update is not None:
+            on_update(val)
+
     # clean the paths of improper file separators for the OS 
-    with warnings.catch_warnings():
-        warnings.simplefilter('ignore')
-        oldname=os.path.sep.join(re.split('[\\\/]', file['source'])) # type: ignore
-        newname=os.path.sep.join(re.split('[\\\/]', file['dest']))   # type: ignore
+    oldname=source.replace('\\', os.sep).replace('/', os.sep)
+    newpath=Path(dest.replace('\\', os.sep).replace('/', os.sep))
+    newname=str(newpath)
 
     # print(f'{oldname = }\n{newname = }')
 
-    # remove the filename leaving just the path
-    dest_path = os.path.sep.join(newname.split(os.path.sep)[:-1])
+    claimed = False
     try:
         # create the destination directory if necessary
-        os.makedirs(dest_path, exist_ok=True)
-        filename, file_extension = os.path.splitext(newname)
-        # if filename.endswith('failme'):
+        newpath.parent.mkdir(parents=True, exist_ok=True)
+        # if newpath.stem.endswith('failme'):
             # raise ValueError('Cannot copy this file')
-        # now the directory exists; check if the file already exists
-        if not os.path.exists(newname):  # folder exists, file does not
-            copyop.update(index, {'dest':newname})
-            shutil.copyfile(oldname, newname)
-        else:  # folder exists, file exists as well
-            ii = 1
-            # filename, file_extension = os.path.splitext(newname)
-            while True:
-                test_newname = f'{filename}({str(ii)}){file_extension}'
-                if not os.path.exists(test_newname):
-                    newname = test_newname
-                    copyop.update(index, {'dest':newname, 'renamed':True})
-                    shutil.copyfile(oldname, newname)
-                    break 
-                ii += 1
+        # now the directory exists; take the first free name (file, file(1), file(2), ...)
+        claimed_path, renamed = _claim_destination(newpath)
+        claimed = True
+        newname = str(claimed_path)
+        update({'dest':newname, 'renamed':True} if renamed else {'dest':newname})
+        _fast_copy(oldname, newname)
     
         logger.info("Deidentifying file.")
         delete_associated_image(newname,'label')
@@ -420,17 +667,33 @@ def copy_and_strip(file: dict[str, str], copyop: CopyOp, index: int):
         logger.info("Deidentification complete.")
     except Exception as e:
         try:
-            os.remove(newname)
+            # only remove a file this call created; the name may belong to another copy
+            if claimed:
+                os.remove(newname)
         except FileNotFoundError:
             pass
         finally:
-            copyop.update(index, {'failed':True,'failure_message':f'{e}'})
+            update({'failed':True,'failure_message':f'{e}'})
             logger.error("Deidentification failed; removed copied file.")
     finally:
-        copyop.update(index, {'done':True})
-    return
+        update({'done':True})
+    return status
+
+# _claim_destination: atomically create the first free name among dest, dest(1), dest(2), ...
+#   O_EXCL makes the existence check and the create a single step, so copies running
+#   concurrently for the same destination can never both take one name
+def _claim_destination(newpath: Path) -> tuple[Path, bool]:
+    candidate = newpath
+    ii = 0
+    while True:
+        try:
+            os.close(os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            return candidate, ii > 0
+        except FileExistsError:
+            ii += 1
+            candidate = newpath.with_name(f'{newpath.stem}({ii}){newpath.suffix}')
 
-def do_copy_and_strip(files:list[dict[str,str]]):
+def do_copy_and_strip(files:list[dict[str,str]], workers:int=1):
     """ Run svs-deidentifier do_copy_and_strip
 
         Parameters
@@ -439,6 +702,9 @@ def do_copy_and_strip(files:list[dict[str,str]]):
                 List of dictionaries with 2 keys for each WSI file:
                 * `source` : path of original file location
                 * `dest` : path to desired file location for copied file 
+
+            workers : int, default=1
+                Number of files to copy and strip concurrently
     
     """
     copyop = CopyOp([{'source':f['source'],
@@ -447,14 +713,15 @@ def do_copy_and_strip(files:list[dict[str,str]]):
                       'done':False,
                       'renamed':False,
                       'failed':False,
-                      'failure_message':''} for f in files])
+                      'failure_message':''} for f in files],
+                    threadsafe=workers > 1)
 
     # threading.Thread(target=track_copy_progress, args=[copyop]).start()            
     # threading.Thread(target=copy_and_strip_all, args=[files, copyop]).start()
     # for index, f in enumerate(files):
     #     threading.Thread(target=copy_and_strip, args=[f, copyop, index]).start()
 
-    copy_and_strip_all(files, copyop)
+    copy_and_strip_all(files, copyop, workers=workers)
     return
 
 
@@ -493,26 +760,31 @@ def run_svs_deidentifier(
     if set(df.columns) != {"source", "destination"}:
         raise ValueError('CSV must contain "source" and "destination" columns.')
 
+    # one shared CopyOp for the whole CSV; filesize is filled in per row so a
+    # missing source only fails its own row
+    copyop = CopyOp(
+        [
+            {
+                "source": source,
+                "dest": None,
+                "filesize": None,
+                "done": False,
+                "renamed": False,
+                "failed": False,
+                "failure_message": "",
+            }
+            for source in df["source"]
+        ],
+        threadsafe=False,
+    )
+
     results: list[dict[str, str]] = []
-    for _, row in df.iterrows():
+    for index, (_, row) in enumerate(df.iterrows()):
         file_info = {"source": row["source"], "dest": row["destination"]}
         try:
-            filesize = os.stat(file_info["source"]).st_size
-            copyop = CopyOp(
-                [
-                    {
-                        "source": file_info["source"],
-                        "dest": None,
-                        "filesize": filesize,
-                        "done": False,
-                        "renamed": False,
-                        "failed": False,
-                        "failure_message": "",
-                    }
-                ]
-            )
-            copy_and_strip(file_info, copyop, 0)
-            status = copyop.read()[0]
+            copyop.update(index, {"filesize": os.stat(file_info["source"]).st_size})
+            copy_and_strip(file_info, copyop, index)
+            status = copyop.value[index]
             if status.get("failed") and fail_fast:
                 raise RuntimeError("Deidentification failed with fail-fast enabled.")
             results.append(
@@ -543,28 +815,13 @@ def deidentify_one(
     fail_fast: bool = False,
 ) -> dict[str, str]:
     try:
-        filesize = os.stat(source).st_size
-        copyop = CopyOp(
-            [
-                {
-                    "source": source,
-                    "dest": None,
-                    "filesize": filesize,
-                    "done": False,
-                    "renamed": False,
-                    "failed": False,
-                    "failure_message": "",
-                }
-            ]
-        )
-        copy_and_strip({"source": source, "dest": destination}, copyop, 0)
-        status = copyop.read()[0]
+        status = _copy_and_strip_nolock(source, destination)
         if status.get("failed") and fail_fast:
             raise RuntimeError("Deidentification failed with fail-fast enabled.")
         return {
-            "destination": status.get("dest") or destination,
+            "destination": str(status.get("dest") or destination),
             "status": "success" if not status.get("failed") else "failed",
-            "error": status.get("failure_message", ""),
+            "error": str(status.get("failure_message", "")),
         }
     except Exception as exc:
         if fail_fast:
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
+import csv
+import functools
 import hashlib
 import json
 import logging
+import math
+import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
 
 import pandas as pd
 
 from . import __version__
 from .config import PipelineConfig
-from .deidentification import deidentify_one
-from .s3 import upload_file_to_s3
-from .submission import generate_metadata_file_record, write_submission_csv
 from .utils import md5_checksum
 
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+# deidentification, s3 (boto3) and submission are imported where they are used,
+# so dry runs and `svs-deid --help` do not pay for them at startup
+
 REQUIRED_MANIFEST_COLUMNS = {"location", "rid", "specnum_formatted", "stain", "sample_id"}
+# run_pipeline hands the manifest to the workers in chunks of this many rows, so the
+# per-row records and the derived CSV are built one chunk at a time
+MANIFEST_CHUNKSIZE = 10_000
+STATUS_COLUMNS = [
+    "destination",
+    "source_hash",
+    "status",
+    "error",
+    "md5",
+    "upload_status",
+    "s3_uri",
+    "local_deleted",
+]
+S3_MANIFEST_COLUMNS = ["local_path", "s3_uri"]
 EXPECTED_SVS_DEID_REMOTE = "https://github.com/pearcetm/svs-deidentifier"
 
 
@@ -57,12 +82,18 @@ def _check_svs_deidentifier_submodule() -> None:
 
 
 def read_manifest(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    # only the required columns are parsed. Their types are still inferred exactly as a plain
+    # read_csv would: the rid/specnum_formatted text feeds destination_basename, so reading
+    # `00123` as text instead of 123 would rename every slide from earlier runs
+    df = pd.read_csv(path, usecols=lambda column: column in REQUIRED_MANIFEST_COLUMNS)
+    return _prepare_manifest(df, path.parent)
+
+
+def _prepare_manifest(df: pd.DataFrame, manifest_dir: Path) -> pd.DataFrame:
     missing = REQUIRED_MANIFEST_COLUMNS.difference(df.columns)
     if missing:
         raise ValueError(f"Manifest missing required columns: {sorted(missing)}")
     df = df[df["location"].notna()].copy()
-    manifest_dir = path.parent
 
     def _resolve_location(value: str) -> str:
         loc = Path(value)
@@ -72,34 +103,61 @@ def read_manifest(path: Path) -> pd.DataFrame:
             return str(loc.resolve())
         return str((manifest_dir / loc))
 
-    df["location"] = df["location"].astype(str).map(_resolve_location)
+    df["location"] = [_resolve_location(value) for value in df["location"].astype(str).tolist()]
     return df
 
 
+_sha256 = hashlib.sha256
+
+
+# both caches grow with the manifest; run_pipeline clears them when it finishes
+@functools.cache
 def _stable_hash(value: str) -> str:
-    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return _sha256(value.encode("utf-8")).hexdigest()
+
+
+@functools.cache
+def _destination_basename(source_key: str) -> str:
+    return f"svs_{_stable_hash(source_key)[:16]}.svs"
 
 
 def destination_basename(row: pd.Series) -> str:
-    source_key = f"{row['rid']}|{row['specnum_formatted']}"
-    hashed = _stable_hash(source_key)[:16]
-    return f"svs_{hashed}.svs"
+    return _destination_basename(f"{row['rid']}|{row['specnum_formatted']}")
 
 
 def build_source_dest_df(df: pd.DataFrame, out_dir: Path) -> pd.DataFrame:
-    svs_dir = out_dir / "svs"
-    destinations = [str(svs_dir / destination_basename(row)) for _, row in df.iterrows()]
-    return pd.DataFrame({"source": df["location"].astype(str), "destination": destinations})
+    # same naming as destination_basename, built from the raw columns rather than per-row Series
+    svs_prefix = os.path.join(str(out_dir / "svs"), "svs_")
+    keys = [
+        f"{rid}|{specnum}"
+        for rid, specnum in zip(df["rid"].to_numpy(), df["specnum_formatted"].to_numpy())
+    ]
+    destinations = [f"{svs_prefix}{_stable_hash(key)[:16]}.svs" for key in keys]
+    # plain object columns, so itertuples hands back native str without per-row conversion
+    return pd.DataFrame(
+        {"source": df["location"].astype(str).astype(object), "destination": destinations},
+        dtype=object,
+    )
 
 
-def write_derived_csv(df: pd.DataFrame, out_dir: Path) -> Path:
+def write_derived_csv(df: pd.DataFrame, out_dir: Path, *, append: bool = False) -> Path:
     derived_dir = out_dir / "derived"
     derived_dir.mkdir(parents=True, exist_ok=True)
     derived_path = derived_dir / "source_destination.csv"
-    df.to_csv(derived_path, index=False)
+    if append:
+        df.to_csv(derived_path, mode="a", header=False, index=False)
+    else:
+        df.to_csv(derived_path, index=False)
     return derived_path
 
 
+def _finish_derived_csv(out_dir: Path, written: bool) -> Path:
+    # an empty manifest yields no chunks; still leave a header-only derived CSV
+    if not written:
+        return write_derived_csv(pd.DataFrame(columns=["source", "destination"]), out_dir)
+    return out_dir / "derived" / "source_destination.csv"
+
+
 def write_status_csv(status_rows: list[dict[str, str]], out_dir: Path) -> Path:
     status_dir = out_dir / "status"
     status_dir.mkdir(parents=True, exist_ok=True)
@@ -109,6 +167,58 @@ def write_status_csv(status_rows: list[dict[str, str]], out_dir: Path) -> Path:
     return status_path
 
 
+def _csv_value(value: Any) -> Any:
+    # rows loaded back from CSV by pandas carry NaN for empty cells
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return value
+
+
+class _CsvAppender:
+    """Append rows to a CSV file, opening it and writing the header on the first row."""
+
+    def __init__(
+        self,
+        path: Path,
+        fieldnames: list[str],
+        *,
+        initial_rows: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.path = path
+        self.fieldnames = fieldnames
+        self.initial_rows = list(initial_rows or [])
+        self._handle: TextIO | None = None
+        self._writer: csv.DictWriter | None = None
+
+    def _open(self) -> tuple[TextIO, csv.DictWriter]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # stays open across write() calls and is closed in close()
+        handle = open(self.path, "w", newline="", encoding="utf-8", buffering=1 << 20)  # noqa: SIM115
+        writer = csv.DictWriter(handle, fieldnames=self.fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for row in self.initial_rows:
+            writer.writerow({key: _csv_value(row.get(key)) for key in self.fieldnames})
+        return handle, writer
+
+    def write(self, row: dict[str, Any]) -> None:
+        if self._handle is None or self._writer is None:
+            self._handle, self._writer = self._open()
+        self._writer.writerow({key: _csv_value(row.get(key)) for key in self.fieldnames})
+        self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = None
+        self._writer = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
 def write_run_journal(config: PipelineConfig, out_dir: Path, counts: dict[str, int]) -> Path:
     journal_path = out_dir / "run.json"
     payload = {
@@ -140,8 +250,8 @@ def _load_existing_status(out_dir: Path) -> dict[str, dict[str, str]]:
     status_path = out_dir / "status" / "status.csv"
     if not status_path.exists():
         return {}
-    df = pd.read_csv(status_path)
-    return {row["destination"]: row for _, row in df.iterrows()}
+    records = pd.read_csv(status_path).to_dict(orient="records")
+    return {record["destination"]: record for record in records}
 
 
 def _load_existing_s3_manifest(out_dir: Path) -> list[dict[str, str]]:
@@ -152,7 +262,111 @@ def _load_existing_s3_manifest(out_dir: Path) -> list[dict[str, str]]:
     return df.to_dict(orient="records")
 
 
-def run_pipeline(config: PipelineConfig) -> dict[str, Path]:
+def _s3_index_key(local_path: str) -> str:
+    # s3_manifest.csv may come from a run with a relative or symlinked out_dir;
+    # key the index on the real path so those still count as uploaded on resume
+    return os.path.realpath(local_path)
+
+
+def _deidentify_stage(item: dict[str, Any], config: PipelineConfig) -> dict[str, str]:
+    previous = item["previous"]
+    if previous is not None:
+        return {
+            "destination": item["destination"],
+            "status": "success",
+            "error": previous.get("error", ""),
+        }
+    from .deidentification import deidentify_one
+
+    return deidentify_one(item["source"], item["destination"], fail_fast=config.fail_fast)
+
+
+def _checksum_stage(
+    result: dict[str, str],
+    config: PipelineConfig,
+    s3_manifest_index: dict[str, dict[str, str]],
+) -> dict[str, Any]:
+    result_destination = result["destination"]
+    if result["status"] != "success":
+        result["md5"] = ""
+    elif config.s3_bucket and _s3_index_key(result_destination) not in s3_manifest_index:
+        # hashed while the upload reads the file, saving a second full read of the slide
+        result["md5"] = ""
+    else:
+        checksum = md5_checksum(result_destination)
+        result["md5"] = checksum or ""
+    return result
+
+
+def _upload_stage(
+    result: dict[str, Any],
+    manifest_row: dict[str, Any] | None,
+    config: PipelineConfig,
+    s3_manifest_index: dict[str, dict[str, str]],
+) -> dict[str, Any]:
+    result_destination = result["destination"]
+    dest_path = Path(result_destination)
+    upload_status = "not_requested"
+    s3_uri = ""
+    local_deleted = "no"
+    if config.s3_bucket and result["status"] == "success":
+        key_prefix = config.s3_prefix.strip("/") if config.s3_prefix else ""
+        key = f"{key_prefix}/{dest_path.name}" if key_prefix else dest_path.name
+        uploaded = s3_manifest_index.get(_s3_index_key(result_destination))
+        if uploaded is not None:
+            s3_uri = uploaded["s3_uri"]
+            upload_status = "uploaded"
+        else:
+            from .s3 import upload_file_to_s3_with_md5
+
+            s3_uri, checksum = upload_file_to_s3_with_md5(
+                dest_path,
+                config.s3_bucket,
+                key,
+                region=config.s3_region,
+            )
+            result["md5"] = checksum or md5_checksum(result_destination) or ""
+            upload_status = "uploaded"
+            result["s3_entry"] = {"local_path": result_destination, "s3_uri": s3_uri}
+    elif config.s3_bucket:
+        upload_status = "pending"
+
+    if result["status"] == "success" and manifest_row is not None:
+        from .submission import generate_metadata_file_record
+
+        result["record"] = generate_metadata_file_record(
+            manifest_row,
+            result_destination,
+            openslide_path=config.openslide_path,
+            md5=result["md5"] or None,
+        )
+
+    if result["status"] == "success" and config.s3_bucket and not config.keep_local:
+        dest_path.unlink(missing_ok=True)
+        local_deleted = "yes"
+
+    result["upload_status"] = upload_status
+    result["s3_uri"] = s3_uri
+    result["local_deleted"] = local_deleted
+    return result
+
+
+def run_pipeline(config: PipelineConfig) -> dict[str, Any]:
+    try:
+        return _run_pipeline(config)
+    finally:
+        # the hashes are only reused within a run; drop them so a long-lived process
+        # running many manifests does not keep every key it has ever seen
+        _stable_hash.cache_clear()
+        _destination_basename.cache_clear()
+        # the ESM stain index goes too, so the next run sees edited exports; only when the
+        # submission module was loaded, to keep it out of dry runs
+        submission = sys.modules.get(f"{__package__}.submission")
+        if submission is not None:
+            submission._esm_stain_index.cache_clear()
+
+
+def _run_pipeline(config: PipelineConfig) -> dict[str, Any]:
     out_dir = config.out_dir
     out_dir.mkdir(parents=True, exist_ok=True)
     configure_logging(out_dir, config.log_level)
@@ -162,29 +376,44 @@ def run_pipeline(config: PipelineConfig) -> dict[str, Path]:
     _check_svs_deidentifier_submodule()
     if not config.keep_local and not config.s3_bucket and not config.dry_run:
         raise ValueError("keep_local=False requires --s3-bucket for offloading outputs.")
-    manifest_df = read_manifest(config.manifest)
-    source_dest_df = build_source_dest_df(manifest_df, out_dir)
-
-    derived_csv = write_derived_csv(source_dest_df, out_dir)
+    # one read of the whole manifest: chunked reads would infer rid/specnum types per chunk,
+    # and destination names depend on those types
+    manifest = read_manifest(config.manifest)
+    manifest_chunks = (
+        manifest.iloc[start:start + MANIFEST_CHUNKSIZE]
+        for start in range(0, len(manifest), MANIFEST_CHUNKSIZE)
+    )
+    manifest_rows = 0
+    derived_written = False
+
+    def _next_source_dest_chunk() -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+        # each chunk's source/destination pairs are appended to the derived CSV as it is handed out
+        nonlocal manifest_rows, derived_written
+        for manifest_df in manifest_chunks:
+            source_dest_df = build_source_dest_df(manifest_df, out_dir)
+            write_derived_csv(source_dest_df, out_dir, append=derived_written)
+            derived_written = True
+            manifest_rows += len(manifest_df)
+            yield manifest_df, source_dest_df
 
     if config.dry_run:
-        status_csv = write_status_csv(
-            [
-                {
-                    "destination": dest,
-                    "source_hash": "",
-                    "status": "planned",
-                    "error": "",
-                    "md5": "",
-                    "upload_status": "not_requested",
-                    "s3_uri": "",
-                    "local_deleted": "no",
-                }
-                for dest in source_dest_df["destination"]
-            ],
-            out_dir,
-        )
-        run_journal = write_run_journal(config, out_dir, {"manifest_rows": len(manifest_df)})
+        planned_rows = [
+            {
+                "destination": dest,
+                "source_hash": "",
+                "status": "planned",
+                "error": "",
+                "md5": "",
+                "upload_status": "not_requested",
+                "s3_uri": "",
+                "local_deleted": "no",
+            }
+            for _, source_dest_df in _next_source_dest_chunk()
+            for dest in source_dest_df["destination"]
+        ]
+        derived_csv = _finish_derived_csv(out_dir, derived_written)
+        status_csv = write_status_csv(planned_rows, out_dir)
+        run_journal = write_run_journal(config, out_dir, {"manifest_rows": manifest_rows})
         logger.info("Dry-run pipeline complete.")
         return {
             "derived_csv": derived_csv,
@@ -192,147 +421,178 @@ def run_pipeline(config: PipelineConfig) -> dict[str, Path]:
             "run_journal": run_journal,
         }
 
-    status_rows: list[dict[str, str]] = []
     existing_status = _load_existing_status(out_dir) if config.resume else {}
     s3_manifest_rows = _load_existing_s3_manifest(out_dir) if config.resume else []
-    s3_manifest_index = {row.get("local_path"): row for row in s3_manifest_rows}
-    submission_records: list[dict[str, str]] = []
+    s3_manifest_index = {_s3_index_key(row["local_path"]): row for row in s3_manifest_rows}
     processed_count = 0
 
-    manifest_lookup = {str(row["location"]): row for _, row in manifest_df.iterrows()}
-
-    for _, row in source_dest_df.iterrows():
-        source = str(row["source"])
-        destination = str(row["destination"])
-        source_hash = _stable_hash(source)
-        previous = existing_status.get(destination)
-        previous_uploaded = (previous is not None) and previous.get("upload_status") == "uploaded"
-        local_exists = Path(destination).exists()
-
-        if (
-            config.resume
-            and config.s3_bucket
-            and destination in s3_manifest_index
-            and not local_exists
-            and not previous
-        ):
-            # ! I expect this will also throw a dtype error when resuming with s3
-            # ! will leave for now
-            status_rows.append(
-                {
+    # status.csv and s3_manifest.csv are appended row by row as slides finish, so a
+    # crashed run still leaves an up-to-date record without rewriting the whole file
+    status_log = _CsvAppender(out_dir / "status" / "status.csv", STATUS_COLUMNS)
+    s3_log = _CsvAppender(
+        out_dir / "s3_manifest.csv", S3_MANIFEST_COLUMNS, initial_rows=s3_manifest_rows
+    )
+    # rows are keyed by manifest position so the final status/submission files keep
+    # manifest order even though slides finish out of order
+    status_by_index: dict[int, dict[str, str]] = {}
+    records_by_index: dict[int, dict[str, str]] = {}
+
+    def _plan_work() -> Iterator[dict[str, Any]]:
+        # runs lazily on the main thread as the stage pools ask for more work, so the
+        # next manifest chunk's records are only built once the current one has been handed out
+        nonlocal processed_count
+        index = -1
+        for manifest_df, source_dest_df in _next_source_dest_chunk():
+            manifest_records = manifest_df.to_dict(orient="records")
+            # one hash per unique source in the chunk; duplicate locations share it
+            source_hashes = {
+                source: _stable_hash(source) for source in source_dest_df["source"].unique()
+            }
+            for manifest_row, row in zip(manifest_records, source_dest_df.itertuples(index=False)):
+                index += 1
+                source = row.source
+                destination = row.destination
+                source_hash = source_hashes[source]
+                # empty when this destination has no row from an earlier run
+                previous = existing_status.get(destination, {})
+                uploaded = s3_manifest_index.get(_s3_index_key(destination))
+                previous_uploaded = previous.get("upload_status") == "uploaded"
+                local_exists = os.path.exists(destination)
+
+                if (
+                    config.resume
+                    and config.s3_bucket
+                    and uploaded is not None
+                    and not local_exists
+                    and not previous
+                ):
+                    resumed_row = {
+                        "destination": destination,
+                        "source_hash": source_hash,
+                        "status": "success",
+                        "error": "",
+                        "md5": "",
+                        "upload_status": "uploaded",
+                        "s3_uri": uploaded["s3_uri"],
+                        "local_deleted": "yes",
+                    }
+                    status_by_index[index] = resumed_row
+                    status_log.write(resumed_row)
+                    continue
+
+                previous_success = previous.get("status") == "success"
+                if previous_success:
+                    if config.s3_bucket and previous_uploaded:
+                        status_by_index[index] = previous
+                        status_log.write(previous)
+                        continue
+                    if not config.s3_bucket and local_exists:
+                        status_by_index[index] = previous
+                        status_log.write(previous)
+                        continue
+
+                if config.max_files is not None and processed_count >= config.max_files:
+                    continue
+
+                if not previous_success:
+                    processed_count += 1
+                yield {
+                    "index": index,
+                    "source": source,
                     "destination": destination,
                     "source_hash": source_hash,
-                    "status": "success",
-                    "error": "",
-                    "md5": "",
-                    "upload_status": "uploaded",
-                    "s3_uri": s3_manifest_index[destination]["s3_uri"],
-                    "local_deleted": "yes",
+                    "previous": previous if previous_success else None,
+                    "manifest_row": manifest_row,
                 }
-            )
-            continue
-
-        if (previous is not None) and previous.get("status") == "success":
-            if config.s3_bucket and previous_uploaded:
-                status_rows.append(previous)
-                continue
-            if not config.s3_bucket and local_exists:
-                status_rows.append(previous)
-                continue
-
-        if config.max_files is not None and processed_count >= config.max_files:
-            continue
-
-        if (previous is not None) and previous.get("status") == "success":
-            result = {
-                "destination": destination,
-                "status": "success",
-                "error": previous.get("error", ""),
-            }
-        else:
-            result = deidentify_one(source, destination, fail_fast=config.fail_fast)
-            processed_count += 1
 
-        result_destination = result["destination"]
-
-        if result["status"] == "success":
-            checksum = md5_checksum(result_destination)
-            result["md5"] = checksum or ""
-        else:
-            result["md5"] = ""
-
-        upload_status = "not_requested"
-        s3_uri = ""
-        local_deleted = "no"
-        if config.s3_bucket and result["status"] == "success":
-            key_prefix = config.s3_prefix.strip("/") if config.s3_prefix else ""
-            key = f"{key_prefix}/{Path(result_destination).name}" if key_prefix else Path(result_destination).name
-            if result_destination in s3_manifest_index:
-                s3_uri = s3_manifest_index[result_destination]["s3_uri"]
-                upload_status = "uploaded"
-            else:
-                s3_uri = upload_file_to_s3(
-                    Path(result_destination),
-                    config.s3_bucket,
-                    key,
-                    region=config.s3_region,
-                )
-                upload_status = "uploaded"
-                entry = {"local_path": result_destination, "s3_uri": s3_uri}
-                s3_manifest_rows.append(entry)
-                s3_manifest_index[result_destination] = entry
-        elif config.s3_bucket:
-            upload_status = "pending"
-
-        if result["status"] == "success":
-            manifest_row = manifest_lookup.get(source)
-            if manifest_row is not None:
-                record = generate_metadata_file_record(
-                    manifest_row,
-                    result_destination,
-                    openslide_path=config.openslide_path,
-                )
-                submission_records.append(record)
-
-        if result["status"] == "success" and config.s3_bucket and not config.keep_local:
-            Path(result_destination).unlink(missing_ok=True)
-            local_deleted = "yes"
-
-        status_row = pd.Series({
-            "destination": result_destination,
-            "source_hash": source_hash,
-            "status": result["status"],
-            "error": result["error"],
-            "md5": result["md5"],
-            "upload_status": upload_status,
-            "s3_uri": s3_uri,
-            "local_deleted": local_deleted,
-        })
-        # ! assuming we can change append on s3 resuming to series from dict,
-        # ! can consider changing status_rows type_hint to series. Ignoring 
-        # ! type error/warning for now though 
-        status_rows.append(status_row) # type: ignore
-
-        logger.info('iterating through status_rows')
-        for v in status_rows:
-            logger.info(f'status rows ({type(v)}) = {v}')
-        
-        
-        write_status_csv(status_rows, out_dir)
-        if s3_manifest_rows:
-            write_s3_manifest(out_dir, s3_manifest_rows)
+    with status_log, s3_log:
+        # de-identify -> checksum/metadata -> upload run as separate stages on their own
+        # pools, so one slide can upload while the next is being copied and stripped.
+        # At most 2 * workers slides are in flight at once, which bounds disk usage.
+        workers = config.workers
+        max_in_flight = 2 * workers
+        pending_items = _plan_work()
+        in_flight: dict[Future, tuple[str, dict[str, Any]]] = {}
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deid") as deid_pool, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="checksum") as hash_pool, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload") as upload_pool:
+
+            def _fill() -> None:
+                while len(in_flight) < max_in_flight:
+                    item = next(pending_items, None)
+                    if item is None:
+                        return
+                    future = deid_pool.submit(_deidentify_stage, item, config)
+                    in_flight[future] = ("deid", item)
+
+            _fill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BaseException:
+                        for other in in_flight:
+                            other.cancel()
+                        raise
+
+                    if stage == "deid":
+                        next_future = hash_pool.submit(
+                            _checksum_stage, result, config, s3_manifest_index
+                        )
+                        in_flight[next_future] = ("checksum", item)
+                    elif stage == "checksum":
+                        next_future = upload_pool.submit(
+                            _upload_stage, result, item["manifest_row"], config, s3_manifest_index
+                        )
+                        in_flight[next_future] = ("upload", item)
+                    else:
+                        entry = result.pop("s3_entry", None)
+                        if entry is not None:
+                            s3_manifest_rows.append(entry)
+                            s3_manifest_index[_s3_index_key(entry["local_path"])] = entry
+                            s3_log.write(entry)
+
+                        record = result.pop("record", None)
+                        if record is not None:
+                            records_by_index[item["index"]] = record
+
+                        status_row = {
+                            "destination": result["destination"],
+                            "source_hash": item["source_hash"],
+                            "status": result["status"],
+                            "error": result["error"],
+                            "md5": result["md5"],
+                            "upload_status": result["upload_status"],
+                            "s3_uri": result["s3_uri"],
+                            "local_deleted": result["local_deleted"],
+                        }
+                        status_by_index[item["index"]] = status_row
+
+                        status_log.write(status_row)
+                        logger.debug("status row: %s", status_row)
+                _fill()
+
+    derived_csv = _finish_derived_csv(out_dir, derived_written)
+    status_rows = [status_by_index[i] for i in sorted(status_by_index)]
+    submission_records = [records_by_index[i] for i in sorted(records_by_index)]
 
     status_csv = write_status_csv(status_rows, out_dir)
 
+    from .submission import write_submission_csv
+
     submission_path = write_submission_csv(pd.DataFrame(submission_records), out_dir)
 
+    failures = sum(1 for r in status_rows if r["status"] != "success")
     run_journal = write_run_journal(
         config,
         out_dir,
         {
-            "manifest_rows": len(manifest_df),
-            "success": sum(1 for r in status_rows if r["status"] == "success"),
-            "failed": sum(1 for r in status_rows if r["status"] != "success"),
+            "manifest_rows": manifest_rows,
+            "success": len(status_rows) - failures,
+            "failed": failures,
         },
     )
 
@@ -346,4 +606,5 @@ def run_pipeline(config: PipelineConfig) -> dict[str, Path]:
         "run_journal": run_journal,
         "submission_csv": submission_path,
         "s3_manifest": s3_manifest_path,
+        "failures": failures,
     }
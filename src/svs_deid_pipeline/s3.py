@@ -1,32 +1,150 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import threading
 import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
+from typing import Any
 
 logger = logging.getLogger("svs_deid_pipeline.s3")
 
+# boto3 is imported on first use so dry runs and local-only runs never pay for it.
+# The transfer config is built then too; slides are routinely several GB, so they
+# go up in large parts with several parts in flight.
+TRANSFER_CONFIG: Any = None
+BATCH_UPLOAD_WORKERS = 16
+# one shared client serves every upload thread and each multipart upload's part
+# threads; botocore's default pool of 10 connections would make them queue
+MAX_POOL_CONNECTIONS = 32
+# upload_fileobj cannot re-open the file per part the way upload_file does, so s3transfer
+# reads each part of a hashed upload into memory. Smaller parts and a cap on buffered parts
+# bound that to about (HASHED_UPLOAD_BUFFERED_PARTS + 1) * HASHED_UPLOAD_PART_SIZE, i.e.
+# ~144 MiB per concurrent hashed upload, instead of 10 x 64 MiB.
+HASHED_UPLOAD_PART_SIZE = 16 * 1024 * 1024
+HASHED_UPLOAD_BUFFERED_PARTS = 8
 
-def upload_file_to_s3(
+_clients: dict[str | None, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_transfer_config() -> Any:
+    global TRANSFER_CONFIG
+    if TRANSFER_CONFIG is None:
+        from boto3.s3.transfer import TransferConfig  # type: ignore
+
+        TRANSFER_CONFIG = TransferConfig(
+            multipart_threshold=64 * 1024 * 1024,
+            multipart_chunksize=64 * 1024 * 1024,
+            max_concurrency=8,
+            use_threads=True,
+        )
+    return TRANSFER_CONFIG
+
+
+def _get_hashing_transfer_config() -> Any:
+    from boto3.s3.transfer import TransferConfig  # type: ignore
+
+    base = _get_transfer_config()
+    config = TransferConfig(
+        multipart_threshold=base.multipart_threshold,
+        multipart_chunksize=min(base.multipart_chunksize, HASHED_UPLOAD_PART_SIZE),
+        max_concurrency=base.max_concurrency,
+        use_threads=base.use_threads,
+    )
+    # s3transfer setting that boto3's TransferConfig does not take as an argument
+    config.max_in_memory_upload_chunks = HASHED_UPLOAD_BUFFERED_PARTS
+    return config
+
+
+def _get_client(region: str | None) -> Any:
+    # creating a client is slow; they are thread-safe, so keep one per region
+    with _clients_lock:
+        client = _clients.get(region)
+        if client is None:
+            import boto3
+            from botocore.config import Config  # type: ignore
+
+            client = boto3.client(
+                "s3",
+                region_name=region,
+                config=Config(max_pool_connections=MAX_POOL_CONNECTIONS),
+            )
+            _clients[region] = client
+        return client
+
+
+class _HashingReader:
+    """Read-only file wrapper that feeds the bytes handed to boto3 through MD5.
+
+    boto3 may read a range more than once (checksums, retries); bytes that were
+    already hashed are skipped so the digest covers each byte exactly once.
+    """
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self._size = os.fstat(handle.fileno()).st_size
+        self._md5 = hashlib.md5()
+        self._hashed = 0
+        self._skipped = False
+
+    def read(self, size: int = -1) -> bytes:
+        position = self._handle.tell()
+        data = self._handle.read(size)
+        end = position + len(data)
+        if position > self._hashed:
+            self._skipped = True
+        elif end > self._hashed:
+            self._md5.update(memoryview(data)[self._hashed - position:])
+            self._hashed = end
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._handle.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._handle.tell()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def hexdigest(self) -> str | None:
+        if self._skipped or self._hashed != self._size:
+            return None
+        return self._md5.hexdigest()
+
+
+def _upload_file(
     local_path: Path,
     bucket: str,
     key: str,
     *,
-    region: str | None = None,
-    max_retries: int = 3,
-    backoff_seconds: float = 1.0,
-) -> str:
-    client = boto3.client("s3", region_name=region)
+    region: str | None,
+    max_retries: int,
+    backoff_seconds: float,
+    with_md5: bool,
+) -> tuple[str, str | None]:
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    client = _get_client(region)
+    transfer_config = _get_hashing_transfer_config() if with_md5 else _get_transfer_config()
     logger.info("Uploading %s to s3://%s/%s", local_path.name, bucket, key)
     attempts = 0
     while True:
         try:
-            client.upload_file(str(local_path), bucket, key)
+            checksum = None
+            if with_md5:
+                with open(local_path, "rb") as handle:
+                    reader = _HashingReader(handle)
+                    client.upload_fileobj(reader, bucket, key, Config=transfer_config)
+                    checksum = reader.hexdigest()
+            else:
+                client.upload_file(str(local_path), bucket, key, Config=transfer_config)
             logger.info("Uploaded %s to s3://%s/%s", local_path.name, bucket, key)
-            return f"s3://{bucket}/{key}"
+            return f"s3://{bucket}/{key}", checksum
         except (BotoCoreError, ClientError) as exc:
             attempts += 1
             if attempts > max_retries:
@@ -45,6 +163,83 @@ def upload_file_to_s3(
             time.sleep(backoff_seconds * (2**(attempts - 1)))
 
 
+def upload_file_to_s3(
+    local_path: Path,
+    bucket: str,
+    key: str,
+    *,
+    region: str | None = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+) -> str:
+    s3_uri, _ = _upload_file(
+        local_path,
+        bucket,
+        key,
+        region=region,
+        max_retries=max_retries,
+        backoff_seconds=backoff_seconds,
+        with_md5=False,
+    )
+    return s3_uri
+
+
+def upload_file_to_s3_with_md5(
+    local_path: Path,
+    bucket: str,
+    key: str,
+    *,
+    region: str | None = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+) -> tuple[str, str | None]:
+    """Upload a file and return its S3 URI and MD5, hashing the bytes as they are read for the upload.
+
+    The MD5 is None if boto3 did not read the file strictly front to back. Parts are
+    buffered in memory while they upload; see HASHED_UPLOAD_PART_SIZE for the bound.
+    """
+    return _upload_file(
+        local_path,
+        bucket,
+        key,
+        region=region,
+        max_retries=max_retries,
+        backoff_seconds=backoff_seconds,
+        with_md5=True,
+    )
+
+
+def upload_files_to_s3(
+    pairs: Iterable[tuple[Path, str]],
+    bucket: str,
+    *,
+    region: str | None = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+) -> list[str]:
+    """Upload (local_path, key) pairs on a shared pool and client; returns S3 URIs in input order.
+
+    Uploads start as pairs are pulled from `pairs`, so a generator can feed files as they are found.
+    """
+    with ThreadPoolExecutor(max_workers=BATCH_UPLOAD_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                _upload_file,
+                local_path,
+                bucket,
+                key,
+                region=region,
+                max_retries=max_retries,
+                backoff_seconds=backoff_seconds,
+                with_md5=False,
+            )
+            for local_path, key in pairs
+        ]
+        for done, _ in enumerate(as_completed(futures), start=1):
+            logger.debug("Uploaded %d/%d files to s3://%s", done, len(futures), bucket)
+        return [future.result()[0] for future in futures]
+
+
 def upload_directory_to_s3(
     local_dir: Path,
     bucket: str,
@@ -54,31 +249,32 @@ def upload_directory_to_s3(
     max_retries: int = 3,
     backoff_seconds: float = 1.0,
 ) -> list[dict[str, str]]:
-    client = boto3.client("s3", region_name=region)
     prefix = prefix.strip("/") if prefix else ""
-    manifest: list[dict[str, str]] = []
-
-    for path in sorted(local_dir.rglob("*")):
-        if path.is_dir():
-            continue
-        relative = path.relative_to(local_dir).as_posix()
-        key = f"{prefix}/{relative}" if prefix else relative
-        attempts = 0
-        while True:
-            try:
-                client.upload_file(str(path), bucket, key)
-                break
-            except (BotoCoreError, ClientError) as exc:
-                attempts += 1
-                if attempts > max_retries:
-                    raise RuntimeError(f"S3 upload failed for {path.name}") from exc
-                time.sleep(backoff_seconds * (2**(attempts - 1)))
-
-        manifest.append(
-            {
-                "local_path": str(path),
-                "s3_uri": f"s3://{bucket}/{key}",
-            }
-        )
+    paths: list[Path] = []
+
+    def _pairs() -> Iterator[tuple[Path, str]]:
+        for path in _iter_files(local_dir):
+            relative = path.relative_to(local_dir).as_posix()
+            paths.append(path)
+            yield path, f"{prefix}/{relative}" if prefix else relative
+
+    s3_uris = upload_files_to_s3(
+        _pairs(),
+        bucket,
+        region=region,
+        max_retries=max_retries,
+        backoff_seconds=backoff_seconds,
+    )
+    # results come back in discovery order so the manifest stays deterministic
+    return [
+        {"local_path": str(path), "s3_uri": s3_uri}
+        for path, s3_uri in zip(paths, s3_uris)
+    ]
+
 
-    return manifest
+def _iter_files(local_dir: Path) -> Iterator[Path]:
+    for root, dirnames, filenames in os.walk(local_dir):
+        dirnames.sort()
+        root_path = Path(root)
+        for filename in sorted(filenames):
+            yield root_path / filename
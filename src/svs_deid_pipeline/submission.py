@@ -1,7 +1,10 @@
+import functools
 import logging
 import os
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
 from pathlib import Path
+from typing import Any
 
 import pandas as pd
 
@@ -11,8 +14,11 @@ from .utils import md5_checksum, load_esm_data
 
 logger = logging.getLogger('idcprep')
 
+# slide properties needed for a submission record
+SLIDE_PROPERTY_KEYS = ('aperio.Filename', 'aperio.AppMag')
+
     
-@dataclass
+@dataclass(slots=True)
 class CCDIPathologyMetadataFile:
     SUBMISSION_TEMPLATE_TYPE:str = 'ccdi-dcc'
     SUBMISSION_TEMPLATE_VERSION:str = "1.0.0"
@@ -47,15 +53,17 @@ class CCDIPathologyMetadataFile:
 
     def get_template_metadata(self):
         """View submission template type and version"""
-        return {i:j for i,j in self.__dict__.items() if i.startswith('SUBMISSION_TEMPLATE_')}
+        return {f.name:getattr(self, f.name) for f in fields(self) if f.name.startswith('SUBMISSION_TEMPLATE_')}
 
     def update_record(self, data:dict):
-        valid_keys = set(self.__dict__.keys())
+        valid_keys = {f.name for f in fields(self)}
         proposed_keys = set(data.keys())
         difference = proposed_keys.difference(valid_keys)
         
         assert len(difference) == 0, f'Supplying invalid keys: {sorted(difference)}'
-        self.__dict__.update(data)
+        # slots=True means no instance __dict__ to update in one go
+        for i,j in data.items():
+            setattr(self, i, j)
         return
 
     def get_formatted_record(self):
@@ -63,7 +71,7 @@ class CCDIPathologyMetadataFile:
             header while maintaining key-value pair order
         """        
         formatted = {}
-        for i,j in self.__dict__.items():
+        for i,j in ((f.name, getattr(self, f.name)) for f in fields(self)):
             # ignore metadata values
             if i.startswith('SUBMISSION_TEMPLATE_'):
                 continue
@@ -76,18 +84,21 @@ class CCDIPathologyMetadataFile:
         return formatted
 
 def generate_metadata_file_record(
-    initial_info: pd.Series,
+    initial_info: Mapping[str, Any],
     updated_location: str,
     *,
     openslide_path: Path | None = None,
     esm_export_dir: Path | None = None,
+    md5: str | None = None,
+    file_size: int | None = None,
+    slide_properties: Mapping[str, str] | None = None,
 ):
     """ Generate single row (WSI) of CCDI metadata template
     
         Parameters
         ----------
-            initial_info : pd.Series
-                Known information from manifest spreadsheet. Specifically, we need:
+            initial_info : Mapping
+                Known information from manifest spreadsheet (one manifest record). Specifically, we need:
                 * `sample_id` : used for sample.sample_id
                 * `specnum_formatted` : specimen ID used to compare against ESM data to 
                                         get extra info (e.g., stain). Only used if 
@@ -98,23 +109,32 @@ def generate_metadata_file_record(
             updated_location : str
                 Updated file location after copying during image deidentification. Used for the 
                 actual metadata file instead of the original location
+
+            md5 : str, optional
+                MD5 of the file if the caller already has it; otherwise the file is read again
+
+            file_size : int, optional
+                Size of the file in bytes if the caller already has it
+
+            slide_properties : Mapping, optional
+                Values for `SLIDE_PROPERTY_KEYS` (see `read_slide_properties`); otherwise the 
+                slide is opened with OpenSlide
     
     """
     logger.info(f'Generating CCDI metadata record for {updated_location}')
 
     # try to fill missing stain data from ESM if it exists there
-    if initial_info['stain'] == '' and esm_export_dir:
-        initial_info['stain'] = _attempt_stain_retrieval(
+    # (kept local so the caller's manifest record is not mutated)
+    stain = initial_info['stain']
+    if stain == '' and esm_export_dir:
+        stain = _attempt_stain_retrieval(
             specimen_id=initial_info['specnum_formatted'],
             file_location=initial_info['location'],
             esm_export_dir=esm_export_dir,
         )
-    # open updated location with openslide
-    configure_openslide(openslide_path)
-    from openslide import OpenSlide
-
-    slide = OpenSlide(updated_location)
-    file_image_id = slide.properties['aperio.Filename'] # post metadata deid, this should match image ID
+    if slide_properties is None:
+        slide_properties = read_slide_properties(updated_location, openslide_path=openslide_path)
+    file_image_id = slide_properties['aperio.Filename'] # post metadata deid, this should match image ID
 
     # initialize single row of the CCDI-DCC (v1.0.0) metadata template
     # with hardcoded constants
@@ -122,12 +142,12 @@ def generate_metadata_file_record(
     record.update_record({
         'pathology_file_id': file_image_id,
         'file_url': updated_location,
-        'staining_method': initial_info['stain'],
+        'staining_method': stain,
         'sample_id': initial_info['sample_id'],
         'file_name': f'{file_image_id}.svs',
-        'file_size': os.path.getsize(updated_location),
-        'md5sum': md5_checksum(updated_location),
-        'magnification': slide.properties['aperio.AppMag']
+        'file_size': file_size if file_size is not None else os.path.getsize(updated_location),
+        'md5sum': md5 or md5_checksum(updated_location),
+        'magnification': slide_properties['aperio.AppMag']
     })
 
     logger.info(f'Created record with {record}')
@@ -135,6 +155,15 @@ def generate_metadata_file_record(
     return record.get_formatted_record()
 
 
+def read_slide_properties(slide_path: str, *, openslide_path: Path | None = None) -> dict[str, str]:
+    """Read the properties used in a submission record, opening the slide once"""
+    configure_openslide(openslide_path)
+    from openslide import OpenSlide
+
+    with OpenSlide(slide_path) as slide:
+        return {key: slide.properties[key] for key in SLIDE_PROPERTY_KEYS}
+
+
 def build_submission_dataframe(
     manifest_df: pd.DataFrame,
     source_dest_df: pd.DataFrame,
@@ -144,7 +173,7 @@ def build_submission_dataframe(
 ) -> pd.DataFrame:
     lookup = dict(zip(source_dest_df["source"], source_dest_df["destination"]))
     records: list[dict[str, str]] = []
-    for _, row in manifest_df.iterrows():
+    for row in manifest_df.to_dict(orient="records"):
         destination = lookup.get(str(row["location"]))
         if not destination:
             continue
@@ -172,17 +201,23 @@ def _attempt_stain_retrieval(
     esm_export_dir: Path,
 ):
     """Looks for stain info in ESM data if missing"""
+    return _esm_stain_index(str(esm_export_dir)).get((specimen_id, file_location), '')
+
+
+@functools.lru_cache(maxsize=4)
+def _esm_stain_index(esm_export_dir: str) -> dict[tuple[str, str], str]:
+    """(Specimen Acc#, File Location) -> Stain, loaded once per ESM export directory"""
     esm_data = load_esm_data(esm_export_dir)
 
     if esm_data.empty:
-        return ''
-    
-    if specimen_id in esm_data['Specimen Acc#'].to_list():
-        subset = esm_data[esm_data['Specimen Acc#']==specimen_id]
-        if file_location in subset['File Location'].to_list():
-            return subset[subset['File Location']==file_location]['Stain'].values[0]
-
-    return ''
+        return {}
+
+    index: dict[tuple[str, str], str] = {}
+    rows = zip(esm_data['Specimen Acc#'], esm_data['File Location'], esm_data['Stain'])
+    for specimen_id, file_location, stain in rows:
+        # first matching row wins, as the old scan did
+        index.setdefault((specimen_id, file_location), stain)
+    return index
     
 
 
@@ -1,32 +1,122 @@
+import functools
 import hashlib
+import importlib.util
 import logging
 import os
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
 
 logger = logging.getLogger('idcprep')
+
+# text columns of the Aperio ESM exports that the pipeline reads, declared up front so every
+# export parses them as strings (even when a file has no values) and no post-concat inference is needed
+ESM_SCHEMA = {
+    'Specimen Acc#': str,
+    'File Location': str,
+    'Stain': str,
+    'Comment.1': str,
+}
+
+# Rust-backed calamine parses .xlsx far faster than the default openpyxl; optional extra
+_EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else None
 
 # returns dataframe with empty file locations dropped
 def read_and_extract_data(path: str | Path) -> pd.DataFrame:
     path = Path(path) if isinstance(path, str) else path
 
     if path.suffix == '.xlsx':
-        df = pd.read_excel(path)
+        df = pd.read_excel(path, engine=_EXCEL_ENGINE)
     elif path.suffix == '.csv':
-        df = pd.read_csv(path)
+        df = _read_csv_arrow(path)
+        if df is None:
+            df = pd.read_csv(path)
     else:
         raise ValueError(f'Invalid file type supplied: {path.name}. Expected a .csv or .xlsx file')
     
     assert 'location' in df.columns, f'The provided file ({path}) is missing a "location" column. This column should contain file location paths'
     
-    return df[df['location'].isin(df['location'].dropna())]
-
+    return df.loc[df['location'].notna()]
+
+# pd.read_csv's default NA strings and booleans, so both readers agree on every cell
+_PANDAS_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+_PANDAS_TRUE_VALUES = ['True', 'TRUE', 'true']
+_PANDAS_FALSE_VALUES = ['False', 'FALSE', 'false']
+
+def _read_to_arrow(path: str | Path, names: list[str], text_columns, include_columns=None):
+    """Parse a CSV into an Arrow Table laid out like pd.read_csv would read it
+
+    `names` are pandas' own header labels ('note.1' for a repeated header, 'Unnamed: N'
+    for a blank one); `text_columns` are pinned to string (no inference), as with
+    read_csv's dtype=str, and `include_columns` limits the parse like usecols.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pv  # type: ignore
+
+    def read(column_types):
+        return pv.read_csv(
+            path,
+            read_options=pv.ReadOptions(column_names=names, skip_rows=1),
+            convert_options=pv.ConvertOptions(
+                column_types=column_types,
+                include_columns=include_columns,
+                null_values=_PANDAS_NA_VALUES,
+                true_values=_PANDAS_TRUE_VALUES,
+                false_values=_PANDAS_FALSE_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+
+    column_types = {name: pa.string() for name in text_columns}
+    table = read(column_types)
+    # pandas never parses dates or times by itself, so such columns are re-read as text,
+    # and a column with no values at all is float64 (all NaN) in pandas, not Arrow's null
+    retype = {}
+    for field in table.schema:
+        if pa.types.is_temporal(field.type):
+            retype[field.name] = pa.string()
+        elif pa.types.is_null(field.type):
+            retype[field.name] = pa.float64()
+    if retype:
+        table = read({**column_types, **retype})
+    return table
+
+def _read_csv_arrow(path: Path) -> pd.DataFrame | None:
+    # None when pyarrow is not installed, so the pandas reader runs instead
+    if importlib.util.find_spec('pyarrow') is None:
+        return None
+    import pyarrow.compute as pc  # type: ignore
+
+    names = list(pd.read_csv(path, nrows=0).columns)
+    assert 'location' in names, f'The provided file ({path}) is missing a "location" column. This column should contain file location paths'
+
+    table = _read_to_arrow(path, names, ['location'])
+    # empty locations are dropped on the Arrow side; the kept rows keep their read_csv
+    # labels, as df.loc[mask] does on the pandas path
+    valid = pc.is_valid(table['location'])
+    df = table.filter(valid).to_pandas()
+    df.index = pd.Index(pc.indices_nonzero(valid).to_numpy().astype('int64'))
+    return df
+
 def format_output_path(output_dir: str | Path, original_path: str):
     filename = os.path.basename(original_path)
 
     return os.path.join(output_dir, f'deid_{filename}') # should still have .svs file extension
 
+# everything up to the last path separator, i.e. what os.path.basename strips
+_DIRNAME_RE = f'^.*[{re.escape(os.sep + (os.altsep or ""))}]'
+
+def format_output_paths(output_dir: str | Path, original_paths: pd.Series) -> pd.Series:
+    """Vectorized format_output_path: one string pass over the column instead of a call per row"""
+    filenames = original_paths.astype(str).str.replace(_DIRNAME_RE, '', regex=True)
+    return os.path.join(output_dir, 'deid_') + filenames
+
 
 def calculate_ccdi_file_sizes(locations):
     """ Get file sizes of specified file locations
@@ -42,11 +132,20 @@ def calculate_ccdi_file_sizes(locations):
                 Series of file sizes in bytes
     
     """
-    abs_paths = locations.apply(os.path.abspath)
+    paths = list(locations)
+    if len(paths) > _STAT_THREADS_THRESHOLD:
+        # stat releases the GIL, so large manifests are stat'ed from a small thread pool
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            sizes = list(executor.map(_file_size, paths, chunksize=64))
+    else:
+        sizes = [_file_size(path) for path in paths]
+
+    return sum(sizes) / 1_000_000_000
 
-    sizes = abs_paths.apply(os.path.getsize)
+_STAT_THREADS_THRESHOLD = 1000
 
-    return sizes.sum() / 1_000_000_000
+def _file_size(path) -> int:
+    return os.stat(path).st_size
 
 def md5_checksum(file_path: str, block_size: int = 2**20):
     """ Calculate MD5 checksum of a file
@@ -57,25 +156,53 @@ def md5_checksum(file_path: str, block_size: int = 2**20):
                 Path to the file
 
             block_size : int, default=1 MB
-                The size of chunks to read the file 
+                The size of reads fed to the hash when hashlib.file_digest is unavailable
 
         Returns
         -------
             hash : str
                 32-character hexadecimal MD5 checksum
     """
-    m = hashlib.md5()
     try:
         with open(file_path, 'rb') as fn:
+            if hasattr(hashlib, 'file_digest'):
+                # hashes in C and releases the GIL, so upload threads keep running
+                return hashlib.file_digest(fn, 'md5').hexdigest()
+            # older Pythons: reuse one buffer instead of allocating a bytes object per block
+            m = hashlib.md5()
+            buffer = bytearray(block_size)
+            view = memoryview(buffer)
             while True:
-                data = fn.read(block_size)
-                if not data:
+                n = fn.readinto(buffer)
+                if not n:
                     break
-                m.update(data)
+                m.update(view[:n])
     except IOError:
         logger.warning("File could not be read for checksum.")
         return None
-    return m.hexdigest()
+    return m.hexdigest()
+
+def md5_checksum_many(paths: Iterable[str], workers: int | None = None) -> list[str | None]:
+    """ Calculate MD5 checksums of many files in parallel, one file per worker process
+
+        Parameters
+        ----------
+            paths : Iterable[str]
+                Paths to the files (e.g. a pd.Series of locations)
+
+            workers : int, optional
+                Number of worker processes. Defaults to os.cpu_count()
+
+        Returns
+        -------
+            hashes : list[str | None]
+                Checksums in the same order as `paths`; None for files that could not be read
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return list(executor.map(md5_checksum, paths, chunksize=4))
 
 
 
@@ -101,44 +228,99 @@ def read_and_merge_data(dir: str | Path) -> pd.DataFrame:
                 All exported ESM data -- unformatted (e.g., manual entries/markers such as stains)
     
     """
-    assert os.path.isdir(dir), f'Path passed was not a directory: {dir}'
-    
-    dfs = [pd.read_csv(os.path.join(dir, i)) for i in os.listdir(dir)]
-    logger.info(f'Read {len(dfs)} exported CSVs from {dir}')
-
-    merged = pd.concat(dfs, ignore_index=True).infer_objects()
-    merged['Comment.1'] = merged['Comment.1'].replace(regex='stain_', value='STAIN_')
+    # one directory read gives names and entry types, no stat per file
+    with os.scandir(dir) as entries:
+        paths = [entry.path for entry in entries if entry.is_file() and entry.name.endswith('.csv')]
+    merged = _read_csvs_arrow(paths)
+    if merged is None:
+        # the C parser releases the GIL, so files are parsed concurrently
+        with ThreadPoolExecutor() as executor:
+            read = functools.partial(pd.read_csv, dtype=ESM_SCHEMA, usecols=_is_export_column)
+            dfs = list(executor.map(read, paths))
+        merged = pd.concat(dfs, ignore_index=True)
+    logger.info(f'Read {len(paths)} exported CSVs from {dir}')
+
+    merged['Comment.1'] = merged['Comment.1'].str.replace('stain_', 'STAIN_', regex=False)
     logger.info(f'Removed extra column and updated stain markers to "STAIN_"')
-    return merged.drop(columns=['Unnamed: 11'])
+    return merged
+
+def _is_export_column(name: str) -> bool:
+    # Aperio exports end each line with a trailing comma, which pandas reads as an empty
+    # 'Unnamed: N' column; skipping it at parse time beats parsing and then dropping it
+    return not name.startswith('Unnamed')
 
+def _read_csvs_arrow(paths: list[str]) -> pd.DataFrame | None:
+    """Parse CSVs with pyarrow's threaded reader, typed like the pandas fallback.
+
+    Returns None when pyarrow is not installed (it is an optional extra) so the caller
+    can fall back to pandas.
+    """
+    if not paths or importlib.util.find_spec('pyarrow') is None:
+        return None
+
+    dfs = []
+    for path in paths:
+        # keep pandas' header names ('Comment.1', 'Unnamed: 11') so downstream column lookups match
+        names = list(pd.read_csv(path, nrows=0).columns)
+        keep = [name for name in names if _is_export_column(name)]
+        # ESM_SCHEMA columns are text and the rest inferred per file, as with read_csv(dtype=ESM_SCHEMA)
+        text_columns = [name for name in ESM_SCHEMA if name in keep]
+        dfs.append(_read_to_arrow(path, names, text_columns, include_columns=keep).to_pandas())
+    # concatenated in pandas so mixed per-file types promote exactly as on the fallback path
+    return pd.concat(dfs, ignore_index=True)
+
 def update_stain_info(data: pd.DataFrame):
     """Updates Stain values of provided dataframe in place according to comments"""
-    cleaned_comments = data.dropna(subset='Comment.1').filter(['Stain', 'Comment.1'])
-    
-    # only get rows with a stain in the comments
-    filtered_comments = cleaned_comments[cleaned_comments['Comment.1'].str.contains('STAIN_')]
+    # only get rows with a stain in the comments (missing comments count as no match);
+    # one literal scan builds the mask, no dropna/filter copies of the frame
+    comments = data['Comment.1']
+    filtered_comments = comments.loc[comments.str.contains('STAIN_', regex=False, na=False)]
 
     # override current stain entry with the comment version
     # typically a nan value, but sometimes populated with closest entry in ESM while comment
     # contains slightly more detail about the stain (e.g., NF entry but NF200 comment)
-    resolved = filtered_comments['Comment.1'].map(_resolve_stain)
+    resolved = _resolve_stains(filtered_comments)
 
-    # merge back with original dataframe
-    data.update({'Stain':resolved}) # type:ignore
+    # write back in place; like DataFrame.update, never overwrite a stain with a missing value
+    resolved = resolved.dropna()
+    data.loc[resolved.index, 'Stain'] = resolved.to_numpy()
 
     logger.info(f'Successfully updated stains from manual entries (n={len(filtered_comments)})')
 
-def _resolve_stain(value: str):
-    # split comments containing stain info and other stuff (e.g. CCDI)
-    stain_comment = [i for i in value.split(';') if 'STAIN_' in i][0]
-    # split STAIN tag from the actual stain info
-    stain_parts = stain_comment.split('_')
+# the first ';'-separated comment item containing STAIN_ (leftmost match), then that item's
+# text before its first '_' (the tag, e.g. 'STAIN' or '2STAIN') and up to the next '_' (the stain).
+# Both patterns avoid lookarounds so they also run on Arrow's RE2-based kernels.
+_STAIN_ITEM_RE = r'(?:^|;)(?P<item>[^;]*STAIN_[^;]*)'
+_STAIN_PARTS_RE = r'^(?P<tag>[^_]*)_(?P<stain>[^_]*)'
+
+def _resolve_stains(comments: pd.Series) -> pd.Series:
+    """Vectorized stain extraction from comments that contain a STAIN_ tag"""
+    resolved = _resolve_stains_arrow(comments)
+    if resolved is not None:
+        return resolved
+
+    item = comments.str.extract(_STAIN_ITEM_RE)['item']
+    parts = item.str.extract(_STAIN_PARTS_RE)
+    tag, stain = parts['tag'], parts['stain']
     # reformat comments with 2 stains, originally separated by a comma
     # to be separated by a semicolon 
-    if stain_parts[0].startswith('2'):
-        return ';'.join(stain_parts[1].split(','))
-    else:
-        return stain_parts[1]
+    two_stains = tag.str.startswith('2')
+    return stain.where(~two_stains, stain.str.replace(',', ';', regex=False))
+
+def _resolve_stains_arrow(comments: pd.Series) -> pd.Series | None:
+    """_resolve_stains on pyarrow.compute string kernels; None when pyarrow is not installed"""
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.compute as pc  # type: ignore
+    except ImportError:
+        return None
+
+    values = pa.array(comments, type=pa.string(), from_pandas=True)
+    item = pc.struct_field(pc.extract_regex(values, _STAIN_ITEM_RE), 'item')
+    parts = pc.extract_regex(item, _STAIN_PARTS_RE)
+    tag, stain = pc.struct_field(parts, 'tag'), pc.struct_field(parts, 'stain')
+    resolved = pc.if_else(pc.starts_with(tag, '2'), pc.replace_substring(stain, ',', ';'), stain)
+    return pd.Series(resolved.to_numpy(zero_copy_only=False), index=comments.index, dtype=object)
 
 # set up
 def load_esm_data(export_dir: str | Path, debug: bool = False) -> pd.DataFrame:
@@ -152,8 +334,8 @@ def load_esm_data(export_dir: str | Path, debug: bool = False) -> pd.DataFrame:
         Log debugging for:
         - check for mistagged manually entered stains
     """
-    directory = Path(export_dir)
-    if not os.path.exists(directory):
+    directory = Path(export_dir)
+    if not directory.is_dir():
         logger.warning(f'No ESM data detected')
         return pd.DataFrame()
 
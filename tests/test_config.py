@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from svs_deid_pipeline.config import (
+    _read_env,
+    _read_yaml,
+    _read_yaml_cached,
+    load_config,
+)
+
+
+def test_read_yaml_returns_copy_and_tracks_changes(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("workers: 2\n", encoding="utf-8")
+
+    first = _read_yaml(path)
+    first["workers"] = 99
+    assert _read_yaml(path) == {"workers": 2}
+
+    path.write_text("workers: 4\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _read_yaml(path) == {"workers": 4}
+
+
+def test_read_yaml_uses_json_sidecar(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("workers: 2\n", encoding="utf-8")
+
+    assert _read_yaml(path) == {"workers": 2}
+    sidecar = tmp_path / "config.yaml.json"
+    assert sidecar.exists()
+
+    _read_yaml_cached.cache_clear()
+    stat = path.stat()
+    sidecar.write_text(
+        json.dumps({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": {"workers": 3}}),
+        encoding="utf-8",
+    )
+    assert _read_yaml(path) == {"workers": 3}
+
+
+def test_read_yaml_ignores_sidecar_after_older_yaml_restored(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("workers: 2\n", encoding="utf-8")
+    old_stat = path.stat()
+    path.write_text("workers: 4\n", encoding="utf-8")
+    os.utime(path, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns + 1_000_000))
+    assert _read_yaml(path) == {"workers": 4}
+
+    # like cp -p or git checkout of an older revision: older mtime than the sidecar
+    path.write_text("workers: 6\n", encoding="utf-8")
+    os.utime(path, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns - 1_000_000_000))
+    _read_yaml_cached.cache_clear()
+    assert _read_yaml(path) == {"workers": 6}
+    assert json.loads((tmp_path / "config.yaml.json").read_text(encoding="utf-8"))["data"] == {"workers": 6}
+
+
+def test_env_read_at_load_time(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SVS_DEID_WORKERS", "5")
+    monkeypatch.setenv("SVS_DEID_DRY_RUN", "yes")
+    config = load_config(manifest=tmp_path / "manifest.csv", out_dir=tmp_path / "out")
+    assert config.workers == 5
+    assert config.dry_run is True
+
+    # an explicit mapping replaces the environment, even when it is empty
+    assert _read_env({})["workers"] is None
+    config = load_config(manifest=tmp_path / "manifest.csv", out_dir=tmp_path / "out", env={})
+    assert config.workers == 1
+    assert config.dry_run is False
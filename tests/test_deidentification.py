@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import shutil
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from svs_deid_pipeline import deidentification
+from svs_deid_pipeline.deidentification import (
+    CopyOp,
+    copy_and_strip_all,
+    deidentify_one,
+    delete_associated_image,
+    validate_deidentify_metadata,
+    validate_deidentify_metadata_all,
+)
+
+
+@pytest.fixture()
+def copy_barrier(monkeypatch: pytest.MonkeyPatch) -> threading.Barrier:
+    # every copy waits until all of them have picked a destination, so a name taken
+    # twice would show up as a lost file; label/macro stripping needs a real slide
+    barrier = threading.Barrier(4, timeout=10)
+    real_fast_copy = deidentification._fast_copy
+
+    def _fast_copy(src: str, dst: str) -> None:
+        barrier.wait()
+        real_fast_copy(src, dst)
+
+    monkeypatch.setattr(deidentification, "_fast_copy", _fast_copy)
+    monkeypatch.setattr(deidentification, "delete_associated_image", lambda path, image_type: None)
+    return barrier
+
+
+def _write_sources(tmp_path: Path) -> list[Path]:
+    sources = []
+    for index in range(4):
+        source = tmp_path / f"in{index}.svs"
+        source.write_bytes(bytes([index]) * 1024)
+        sources.append(source)
+    return sources
+
+
+def test_deidentify_one_concurrent_same_destination(tmp_path: Path, copy_barrier: threading.Barrier) -> None:
+    sources = _write_sources(tmp_path)
+    destination = tmp_path / "out" / "svs_shared.svs"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda source: deidentify_one(str(source), str(destination)), sources))
+
+    assert [result["status"] for result in results] == ["success"] * 4
+    outputs = {result["destination"] for result in results}
+    assert len(outputs) == 4
+    assert sorted(Path(output).read_bytes() for output in outputs) == sorted(
+        source.read_bytes() for source in sources
+    )
+
+
+def test_copy_and_strip_all_workers_same_destination(tmp_path: Path, copy_barrier: threading.Barrier) -> None:
+    sources = _write_sources(tmp_path)
+    destination = str(tmp_path / "out" / "deid_shared.svs")
+    files = [{"source": str(source), "dest": destination} for source in sources]
+    copyop = CopyOp([{"dest": None, "renamed": False, "failed": False, "done": False} for _ in files])
+
+    copy_and_strip_all(files, copyop, workers=4)
+
+    statuses = copyop.read()
+    assert not any(status["failed"] for status in statuses)
+    assert len({status["dest"] for status in statuses}) == 4
+    assert sum(status["renamed"] for status in statuses) == 3
+    assert all(Path(status["dest"]).exists() for status in statuses)
+
+
+_APERIO = "Aperio Image Library v12.0.15"
+
+
+def _write_striped_svs(path: Path, *, bigtiff: bool) -> None:
+    np = pytest.importorskip("numpy")
+    tifffile = pytest.importorskip("tifffile")
+    rng = np.random.default_rng(0)
+    pages = [
+        ((48, 64), f"{_APERIO} \r\n64x48 [0,0 64x48] JPEG/RGB Q=70|AppMag = 20|Filename = 1234-secret|ImageID = 98765"),
+        ((24, 32), f"{_APERIO} \r\n64x48 -> 32x24|Filename = 1234-secret|ImageID = 98765"),
+        ((20, 30), f"{_APERIO}\r\nlabel 30x20"),
+        ((20, 40), f"{_APERIO}\r\nmacro 40x20"),
+    ]
+    with tifffile.TiffWriter(path, bigtiff=bigtiff) as writer:
+        for shape, description in pages:
+            data = rng.integers(1, 255, shape, dtype="uint8")
+            writer.write(data, description=description, rowsperstrip=8, metadata=None)
+
+
+def _baseline_delete_associated_image(slide_path: Path, image_type: str) -> None:
+    # the label/macro removal as it was before the IFD walk, punch-hole and copy changes
+    from tifffile import TiffFile
+
+    with open(slide_path, "r+b") as fp:
+        t = TiffFile(fp)
+        page = next(page for page in t.pages if image_type in page.description)
+        ifds = [{"this": p.offset} for p in t.pages]
+        for p in ifds:
+            fp.seek(p["this"])
+            (num_tags,) = struct.unpack(t.tiff.tagnoformat, fp.read(t.tiff.tagnosize))
+            fp.seek(num_tags * t.tiff.tagsize, 1)
+            p["next_ifd_offset"] = fp.tell()
+            (p["next_ifd_value"],) = struct.unpack(t.tiff.offsetformat, fp.read(t.tiff.offsetsize))
+        pageifd = next(i for i in ifds if i["this"] == page.offset)
+        previfd = next(i for i in ifds if i["next_ifd_value"] == page.offset)
+        for offset, count in zip(page.tags["StripOffsets"].value, page.tags["StripByteCounts"].value):
+            fp.seek(offset)
+            fp.write(b"\0" * count)
+        for tag in page.tags.values():
+            fp.seek(tag.valueoffset)
+            fp.write(b"\0" * tag.count)
+        fp.seek(pageifd["this"])
+        fp.write(b"\0" * (pageifd["next_ifd_offset"] - pageifd["this"] + t.tiff.offsetsize))
+        fp.seek(previfd["next_ifd_offset"])
+        fp.write(struct.pack(t.tiff.offsetformat, pageifd["next_ifd_value"]))
+        t.close()
+
+
+def _baseline_screen_filenames(slide_path: Path) -> None:
+    from tifffile import TiffFile
+
+    with open(slide_path, "r+b") as fp:
+        t = TiffFile(fp)
+        for page in t.pages:
+            if "Filename" not in page.description:
+                continue
+            parts = [i for i in page.description.split("|") if "Filename = " in i or "ImageID = " in i]
+            kvp = dict(tuple(i.split(" = ")) for i in parts)
+            if kvp["Filename"] != kvp["ImageID"]:
+                updated = f"Filename = {kvp['ImageID']}"
+                page.tags["ImageDescription"].overwrite(page.description.replace(parts[0], updated))
+        t.close()
+
+
+@pytest.mark.parametrize("bigtiff", [False, True], ids=["classic", "bigtiff"])
+def test_strip_associated_images_matches_baseline(tmp_path: Path, bigtiff: bool) -> None:
+    tifffile = pytest.importorskip("tifffile")
+    slide = tmp_path / "slide.svs"
+    _write_striped_svs(slide, bigtiff=bigtiff)
+    expected = tmp_path / "expected.svs"
+    shutil.copyfile(slide, expected)
+
+    with tifffile.TiffFile(slide) as original:
+        associated = [
+            (offset, count)
+            for page in original.pages
+            if "label" in page.description or "macro" in page.description
+            for offset, count in zip(page.tags["StripOffsets"].value, page.tags["StripByteCounts"].value)
+        ]
+    assert len(associated) == 6
+
+    delete_associated_image(str(slide), "label")
+    delete_associated_image(str(slide), "macro")
+    validate_deidentify_metadata(str(slide))
+
+    for image_type in ("label", "macro"):
+        _baseline_delete_associated_image(expected, image_type)
+    _baseline_screen_filenames(expected)
+
+    data = slide.read_bytes()
+    assert data == expected.read_bytes()
+    assert all(data[offset:offset + count] == bytes(count) for offset, count in associated)
+    with tifffile.TiffFile(slide) as stripped:
+        descriptions = [page.description for page in stripped.pages]
+    assert len(descriptions) == 2
+    assert not any("label" in d or "macro" in d for d in descriptions)
+    assert all("Filename = 98765|ImageID = 98765" in d for d in descriptions)
+
+
+@pytest.mark.parametrize("bigtiff", [False, True], ids=["classic", "bigtiff"])
+def test_validate_mode_descriptions_match_tifffile(tmp_path: Path, bigtiff: bool) -> None:
+    np = pytest.importorskip("numpy")
+    tifffile = pytest.importorskip("tifffile")
+    slide = tmp_path / "slide.svs"
+    descriptions = [
+        f"{_APERIO} \r\n64x48 [0,0 64x48] JPEG/RGB Q=70|AppMag = 20|Filename = 98765|ImageID = 98765 \r\n",
+        f"  {_APERIO} \r\n64x48 -> 32x24|Filename = 98765|ImageID = 98765\r\n",
+    ]
+    with tifffile.TiffWriter(slide, bigtiff=bigtiff) as writer:
+        for description in descriptions:
+            writer.write(np.zeros((8, 8), dtype="uint8"), description=description, metadata=None)
+
+    with open(slide, "rb") as fp:
+        tiff_file = tifffile.TiffFile(fp)
+        walked = [page.description for page in deidentification._read_page_descriptions(fp, tiff_file)]
+        expected = [page.description for page in tiff_file.pages]
+        tiff_file.close()
+    assert walked == expected
+
+    report = validate_deidentify_metadata(str(slide), validate_mode=True)
+    assert report["clean_filename"] is True
+
+
+def test_validate_all_checks_duplicate_locations_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pd = pytest.importorskip("pandas")
+    slide = tmp_path / "slide.svs"
+    _write_striped_svs(slide, bigtiff=False)
+    alias = tmp_path / "alias.svs"
+    alias.symlink_to(slide)
+    locations = [str(slide), str(slide), str(alias)]
+    manifest = tmp_path / "manifest.csv"
+    pd.DataFrame({"location": locations}).to_csv(manifest, index=False)
+
+    calls = []
+    real_validate = deidentification.validate_deidentify_metadata
+
+    def _validate(path: str) -> dict:
+        calls.append(path)
+        return real_validate(path)
+
+    monkeypatch.setattr(deidentification, "validate_deidentify_metadata", _validate)
+    validate_deidentify_metadata_all(str(manifest))
+
+    assert calls == [str(slide)]
+    results = pd.read_csv(tmp_path / "validation_results.csv")
+    assert results["path"].tolist() == locations
+    assert results["no_label"].tolist() == [False] * 3
+    assert validate_deidentify_metadata(str(slide), validate_mode=True)["clean_filename"] is True
@@ -31,3 +31,4 @@ def test_read_manifest_drops_empty_locations(tmp_path: Path) -> None:
 
     result = read_manifest(path)
     assert len(result) == 1
+
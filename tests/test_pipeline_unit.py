@@ -3,8 +3,16 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
-from svs_deid_pipeline.pipeline import build_source_dest_df, destination_basename
+from svs_deid_pipeline import pipeline, submission
+from svs_deid_pipeline.pipeline import (
+    _CsvAppender,
+    build_source_dest_df,
+    destination_basename,
+    read_manifest,
+    run_pipeline,
+)
 
 
 def test_destination_basename_is_deterministic() -> None:
@@ -20,3 +28,68 @@ def test_build_source_dest_df(manifest_csv: Path, tmp_path: Path) -> None:
     assert list(result.columns) == ["source", "destination"]
     assert result["destination"].str.contains("/svs/").all()
     assert result["destination"].str.endswith(".svs").all()
+
+
+def test_build_source_dest_df_matches_destination_basename(manifest_csv: Path, tmp_path: Path) -> None:
+    df = pd.read_csv(manifest_csv)
+    out_dir = tmp_path / "out"
+    result = build_source_dest_df(df, out_dir)
+
+    expected = [str(out_dir / "svs" / destination_basename(row)) for _, row in df.iterrows()]
+    assert result["destination"].tolist() == expected
+
+
+def test_destination_names_are_pinned(tmp_path: Path) -> None:
+    # names from earlier runs must not change: resume, S3 keys and sample_ids rely on them.
+    # rid 00123 hashes as 123, and 17 as 17.0 because the column also holds an empty rid
+    path = tmp_path / "manifest.csv"
+    path.write_text(
+        "location,rid,specnum_formatted,stain,sample_id\n"
+        "/data/a.svs,00123,S-1,H&E,a\n"
+        "/data/b.svs,17,00042,H&E,b\n"
+        "/data/c.svs,,7,H&E,c\n",
+        encoding="utf-8",
+    )
+
+    names = [
+        Path(destination).name
+        for destination in build_source_dest_df(read_manifest(path), tmp_path)["destination"]
+    ]
+
+    assert names == [
+        "svs_4e506bee2f341781.svs",
+        "svs_90e7ec8e92177167.svs",
+        "svs_d532e973932fcd6f.svs",
+    ]
+
+
+def test_csv_appender_resumes_with_header_once(tmp_path: Path) -> None:
+    path = tmp_path / "out" / "s3_manifest.csv"
+    # rows already uploaded by the previous run are carried over ahead of the new ones
+    previous = [{"local_path": "/out/svs/a.svs", "s3_uri": "s3://bucket/a.svs"}]
+
+    with _CsvAppender(path, ["local_path", "s3_uri"], initial_rows=previous) as log:
+        assert not path.exists()
+        log.write({"local_path": "/out/svs/b.svs", "s3_uri": "s3://bucket/b.svs"})
+        # each row is flushed, so a crashed run still leaves it on disk
+        assert path.read_text(encoding="utf-8").splitlines()[-1] == "/out/svs/b.svs,s3://bucket/b.svs"
+        log.write({"local_path": "/out/svs/c.svs", "s3_uri": float("nan"), "extra": "ignored"})
+
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "local_path,s3_uri",
+        "/out/svs/a.svs,s3://bucket/a.svs",
+        "/out/svs/b.svs,s3://bucket/b.svs",
+        "/out/svs/c.svs,",
+    ]
+
+
+def test_run_pipeline_clears_esm_stain_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    exports = [pd.DataFrame({"Specimen Acc#": ["S1"], "File Location": ["/a.svs"], "Stain": ["HE"]})]
+    monkeypatch.setattr(submission, "load_esm_data", lambda export_dir: exports[-1])
+    monkeypatch.setattr(pipeline, "_run_pipeline", lambda config: {})
+
+    assert submission._attempt_stain_retrieval("S1", "/a.svs", tmp_path) == "HE"
+    run_pipeline(None)  # type: ignore[arg-type]
+
+    exports.append(pd.DataFrame({"Specimen Acc#": ["S1"], "File Location": ["/a.svs"], "Stain": ["PAS"]}))
+    assert submission._attempt_stain_retrieval("S1", "/a.svs", tmp_path) == "PAS"
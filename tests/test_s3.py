@@ -25,3 +25,38 @@ def test_upload_directory_to_s3(tmp_path: Path) -> None:
     assert len(manifest) == 1
     obj = client.get_object(Bucket=bucket, Key="runs/001/file.txt")
     assert obj["Body"].read().decode("utf-8") == "content"
+
+
+@moto.mock_s3
+def test_upload_file_to_s3_with_md5_multipart(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from boto3.s3.transfer import TransferConfig
+
+    from svs_deid_pipeline import s3
+    from svs_deid_pipeline.utils import md5_checksum
+
+    bucket = "test-bucket"
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=bucket)
+    monkeypatch.setattr(
+        s3,
+        "TRANSFER_CONFIG",
+        TransferConfig(multipart_threshold=5 * 1024 * 1024, multipart_chunksize=5 * 1024 * 1024),
+    )
+
+    file_path = tmp_path / "slide.svs"
+    file_path.write_bytes(bytes(range(256)) * (48 * 1024))
+
+    s3_uri, checksum = s3.upload_file_to_s3_with_md5(file_path, bucket, "slide.svs")
+
+    assert s3_uri == f"s3://{bucket}/slide.svs"
+    assert checksum == md5_checksum(str(file_path))
+
+
+def test_hashed_uploads_bound_buffered_parts() -> None:
+    from svs_deid_pipeline import s3
+
+    config = s3._get_hashing_transfer_config()
+
+    assert config.multipart_chunksize <= s3.HASHED_UPLOAD_PART_SIZE
+    assert config.max_in_memory_upload_chunks == s3.HASHED_UPLOAD_BUFFERED_PARTS
+    assert config.multipart_chunksize * config.max_in_memory_upload_chunks <= 128 * 1024 * 1024
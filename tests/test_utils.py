@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from svs_deid_pipeline.utils import (
+    _resolve_stains,
+    calculate_ccdi_file_sizes,
+    format_output_path,
+    format_output_paths,
+    md5_checksum,
+    md5_checksum_many,
+    read_and_extract_data,
+    read_and_merge_data,
+)
+
+
+def test_md5_checksum_many_matches_md5_checksum(tmp_path: Path) -> None:
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"file{index}.bin"
+        path.write_bytes(bytes([index]) * 1024 * (index + 1))
+        paths.append(str(path))
+    paths.append(str(tmp_path / "missing.bin"))
+
+    result = md5_checksum_many(paths, workers=2)
+
+    assert result == [md5_checksum(path) for path in paths]
+    assert result[-1] is None
+
+
+def _resolve_stain(value: str) -> str:
+    # reference scalar implementation that _resolve_stains replaced
+    stain_comment = next(i for i in value.split(';') if 'STAIN_' in i)
+    stain_parts = stain_comment.split('_')
+    if stain_parts[0].startswith('2'):
+        return ';'.join(stain_parts[1].split(','))
+    return stain_parts[1]
+
+
+def test_resolve_stains_matches_scalar_reference() -> None:
+    comments = pd.Series(
+        [
+            "STAIN_HE",
+            "STAIN_NF200;CCDI",
+            "CCDI;STAIN_CD3",
+            "2STAIN_A,B",
+            "CCDI_1;2STAIN_A,B_extra;STAIN_C",
+            "note;STAIN_",
+            "x_STAIN_Y",
+        ],
+        index=[3, 5, 8, 13, 21, 34, 55],
+    )
+
+    result = _resolve_stains(comments)
+
+    assert result.tolist() == [_resolve_stain(value) for value in comments]
+    assert result.index.equals(comments.index)
+
+
+def test_format_output_paths_matches_scalar() -> None:
+    originals = pd.Series(["/data/a/slide1.svs", "relative/slide2.svs", "slide3.svs"])
+
+    result = format_output_paths("/out", originals)
+
+    assert result.tolist() == [format_output_path("/out", path) for path in originals]
+
+
+@pytest.mark.parametrize("repeat", [1, 400], ids=["serial", "threaded"])
+def test_calculate_ccdi_file_sizes_sums_every_path(tmp_path: Path, repeat: int) -> None:
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "a.svs").write_bytes(b"a" * 1000)
+    (shared / "b.svs").write_bytes(b"b" * 2000)
+    (shared / "unrelated.svs").write_bytes(b"c" * 5000)
+    (tmp_path / "single.svs").write_bytes(b"d" * 4000)
+
+    # 400 repeats gives 1200 paths, past the threshold where sizes are stat'ed in threads
+    locations = pd.Series([str(shared / "a.svs"), str(shared / "b.svs"), str(tmp_path / "single.svs")] * repeat)
+
+    assert calculate_ccdi_file_sizes(locations) == repeat * 7000 / 1_000_000_000
+
+
+def test_read_and_merge_data_arrow_matches_pandas(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("pyarrow")
+    from svs_deid_pipeline import utils
+
+    # a numeric Barcode in one export and an alphanumeric one in the other, dates, an empty
+    # Stain and Comment column, and the trailing-comma 'Unnamed' column
+    (tmp_path / "a.csv").write_text(
+        "Image ID,Barcode,Date,Specimen Acc#,File Location,Stain,Comment,Comment.1,\n"
+        "1,1001,2024-01-02,S1,/a.svs,,,stain_HE,\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "b.csv").write_text(
+        "Image ID,Barcode,Date,Specimen Acc#,File Location,Stain,Comment,Comment.1,\n"
+        "2,AB-7,2024-01-03,S2,/b.svs,HE,,,\n",
+        encoding="utf-8",
+    )
+
+    arrow = read_and_merge_data(tmp_path)
+    monkeypatch.setattr(utils, "_read_csvs_arrow", lambda paths: None)
+    pandas = read_and_merge_data(tmp_path)
+
+    pd.testing.assert_series_equal(arrow.dtypes, pandas.dtypes)
+    pd.testing.assert_frame_equal(arrow, pandas)
+    assert arrow["Comment.1"].tolist()[0] == "STAIN_HE"
+
+
+def test_read_and_extract_data_arrow_matches_pandas(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("pyarrow")
+    from svs_deid_pipeline import utils
+
+    # repeated and blank headers, NA spellings, an empty location, ints with a gap, dates, booleans
+    path = tmp_path / "manifest.csv"
+    path.write_text(
+        "location,rid,note,note,,n,when,flag\n"
+        "/a/b.svs,R1,x,y,z,1,2024-01-02,True\n"
+        ",R2,NA,,q,2,2024-01-03,False\n"
+        "NA,R3,a,b,c,3,2024-01-04,true\n"
+        "/a/c.svs,None,<NA>,n/a,w,,2024-01-05,FALSE\n",
+        encoding="utf-8",
+    )
+
+    arrow = read_and_extract_data(path)
+    monkeypatch.setattr(utils, "_read_csv_arrow", lambda path: None)
+    pandas = read_and_extract_data(path)
+
+    pd.testing.assert_frame_equal(arrow, pandas)